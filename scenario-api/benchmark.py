@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""Benchmark simulation hot paths against their previous implementations."""
+
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.requests import Request
+
+from src.config.settings import MONTE_CARLO_CHUNK_SIZE
+from src.engine import parallel
+from src.engine.rng import BIT_GENERATORS, make_generator
+from src.engine.analytics import SeriesAnalytics
+from src.engine.variance import OUTCOME_PERCENTILES, OutcomeEstimator
+from src.dto.scenario import (
+    ChartDataPoint,
+    DrawdownDataPoint,
+    StressTestParams,
+    StressTestResponse,
+)
+from src.services.stress_test_service import stress_test_service
+from src.services.symbol_stats import SymbolStats
+from src.utils.responses import FastJSONResponse
+from src.utils.wire import PriceHistory, decode_histories
+from src.engine.monte_carlo import (
+    NormalPathModel,
+    path_percentiles,
+    projection_time_points,
+    simulate_paths,
+)
+
+PORTFOLIO_RETURN = 0.08
+PORTFOLIO_VOL = 0.18
+TIME_HORIZON = 10
+BASE_AMOUNT = 10000.0
+
+
+def time_call(fn, repeat=3):
+    """Return the best wall-clock time of ``repeat`` calls in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def legacy_run_simulation(num_sims):
+    """Per-simulation Python loop used by the original _run_simulation."""
+    np.random.seed(42)
+    final_values = []
+    for _ in range(num_sims):
+        random_return = np.random.normal(
+            PORTFOLIO_RETURN * TIME_HORIZON, PORTFOLIO_VOL * np.sqrt(TIME_HORIZON)
+        )
+        final_value = BASE_AMOUNT * (1 + random_return)
+        final_values.append(max(final_value, 0))
+    return final_values
+
+
+def vectorized_run_simulation(num_sims):
+    """Single batched draw of final values, as _run_simulation first did."""
+    final_values = np.empty(num_sims)
+    np.random.default_rng(42).standard_normal(out=final_values)
+
+    # Scale standard normals to returns, then to values, in place
+    final_values *= PORTFOLIO_VOL * np.sqrt(TIME_HORIZON)
+    final_values += 1 + PORTFOLIO_RETURN * TIME_HORIZON
+    final_values *= BASE_AMOUNT
+    np.maximum(final_values, 0, out=final_values)
+    return final_values
+
+
+def bench_final_values():
+    """Compare the legacy loop with the vectorized final-value engine."""
+    print("Monte Carlo final values (legacy loop vs vectorized)")
+    for num_sims in (1_000, 100_000, 1_000_000):
+        repeat = 1 if num_sims >= 1_000_000 else 3
+        legacy = time_call(lambda: legacy_run_simulation(num_sims), repeat)
+        vectorized = time_call(lambda: vectorized_run_simulation(num_sims), repeat)
+        print(
+            f"  {num_sims:>9,} sims: loop {legacy * 1000:9.1f} ms | "
+            f"vectorized {vectorized * 1000:7.2f} ms | "
+            f"speedup {legacy / vectorized:7.1f}x"
+        )
+
+
+def legacy_generate_projections(num_sims):
+    """Per-timepoint resampling loop used by the original _generate_projections."""
+    np.random.seed(42)
+    time_points = projection_time_points(TIME_HORIZON)
+    projections_by_time = []
+    for t in time_points:
+        if t == 0:
+            projections_by_time.append([BASE_AMOUNT] * num_sims)
+            continue
+        sim_values = []
+        for _ in range(num_sims):
+            random_return = np.random.normal(
+                PORTFOLIO_RETURN * t, PORTFOLIO_VOL * np.sqrt(t)
+            )
+            sim_values.append(max(BASE_AMOUNT * (1 + random_return), 0))
+        projections_by_time.append(sim_values)
+    return [
+        [np.percentile(values, p) for values in projections_by_time]
+        for p in (5, 25, 50, 75, 95)
+    ]
+
+
+def path_matrix_projections(num_sims):
+    """Single path-matrix engine used by _run_simulation/_generate_projections."""
+    paths = simulate_paths(
+        PORTFOLIO_RETURN,
+        PORTFOLIO_VOL,
+        projection_time_points(TIME_HORIZON),
+        num_sims,
+        BASE_AMOUNT,
+        np.random.default_rng(42),
+    )
+    return paths[:, -1], path_percentiles(paths)
+
+
+def bench_projections():
+    """Compare per-timepoint resampling with the path-matrix engine."""
+    print("Monte Carlo projections (legacy loop vs path matrix)")
+    for num_sims in (1_000, 10_000):
+        legacy = time_call(lambda: legacy_generate_projections(num_sims), 1)
+        paths = time_call(lambda: path_matrix_projections(num_sims))
+        print(
+            f"  {num_sims:>9,} sims: loop {legacy * 1000:9.1f} ms | "
+            f"path matrix {paths * 1000:7.2f} ms | "
+            f"speedup {legacy / paths:7.1f}x"
+        )
+
+
+def bench_worker_scaling():
+    """Latency of a typical and a large run for growing worker counts."""
+    cores = os.cpu_count() or 1
+    print(
+        f"Monte Carlo run latency by worker count ({cores} CPU core(s), "
+        f"{MONTE_CARLO_CHUNK_SIZE:,} simulations per chunk)"
+    )
+    model = NormalPathModel(
+        PORTFOLIO_RETURN,
+        PORTFOLIO_VOL,
+        projection_time_points(TIME_HORIZON),
+        BASE_AMOUNT,
+    )
+    for num_sims in (10_000, 200_000):
+        # Single-process exact run, the path used before runs were sharded
+        parallel.MONTE_CARLO_WORKERS = 1
+        parallel.shutdown_process_pool()
+        asyncio.run(parallel.run_exact(model, 1_000, 42))  # warm up
+        exact = time_call(
+            lambda: asyncio.run(parallel.run_exact(model, num_sims, 42)), 5
+        )
+        print(f"  {num_sims:>9,} sims: exact, 1 process {exact * 1000:8.1f} ms")
+        for workers in sorted({1, 2, 4, cores}):
+            if workers > cores:
+                continue
+            parallel.MONTE_CARLO_WORKERS = workers
+            parallel.shutdown_process_pool()
+            asyncio.run(
+                parallel.run_streaming(
+                    model, workers * MONTE_CARLO_CHUNK_SIZE, MONTE_CARLO_CHUNK_SIZE, 42
+                )
+            )  # start every worker
+            elapsed = time_call(
+                lambda: asyncio.run(
+                    parallel.run_streaming(model, num_sims, MONTE_CARLO_CHUNK_SIZE, 42)
+                ),
+                5,
+            )
+            print(
+                f"  {num_sims:>9,} sims: sharded, {workers:>2} workers "
+                f"{elapsed * 1000:8.1f} ms | speedup {exact / elapsed:5.2f}x"
+            )
+    if cores == 1:
+        print("  (one CPU core here: run on a multi-core host to see worker scaling)")
+    parallel.shutdown_process_pool()
+
+
+def bench_bit_generators():
+    """Fill a preallocated buffer with standard normals from each bit generator."""
+    print("Standard normal fill, 10M draws into a preallocated buffer")
+    buffer = np.empty(10_000_000)
+    for name in BIT_GENERATORS:
+        rng = make_generator(np.random.SeedSequence(42), name)
+        elapsed = time_call(lambda: rng.standard_normal(out=buffer))
+        print(f"  {name:>9}: {elapsed * 1000:7.1f} ms")
+
+
+def bench_variance_reduction(num_seeds=30, num_sims=2_000):
+    """Spread of the reported outcomes across seeds against their reported errors."""
+    print(
+        f"Outcome spread over {num_seeds} seeds, {num_sims:,} paths "
+        "(sd across seeds / mean reported standard error)"
+    )
+    time_points = projection_time_points(TIME_HORIZON)
+    for method in ("none", "antithetic", "control_variate", "sobol"):
+        model = NormalPathModel(
+            PORTFOLIO_RETURN, PORTFOLIO_VOL, time_points, BASE_AMOUNT, method
+        )
+        estimates, errors = [], []
+        for seed in range(num_seeds):
+            estimator = OutcomeEstimator(BASE_AMOUNT)
+            rng = make_generator(np.random.SeedSequence(seed))
+            paths = model.simulate(rng, num_sims, estimator)
+            profit, profit_error = estimator.profit.estimate()
+            estimates.append(
+                [*np.percentile(paths[:, -1], OUTCOME_PERCENTILES), profit * 100]
+            )
+            errors.append([*estimator.percentile_errors(), profit_error * 100])
+        spread = np.std(estimates, axis=0, ddof=1)
+        reported = np.mean(errors, axis=0)
+        print(
+            f"  {method:>15}: p5 {spread[0]:6.1f}/{reported[0]:6.1f}  "
+            f"p50 {spread[1]:6.1f}/{reported[1]:6.1f}  "
+            f"p95 {spread[2]:6.1f}/{reported[2]:6.1f}  "
+            f"P(profit) {spread[3]:5.2f}/{reported[3]:5.2f} pp"
+        )
+
+
+def synthetic_histories(num_days, num_symbols, missing=0.02):
+    """Business-day close series with a few randomly missing days per symbol."""
+    rng = np.random.default_rng(7)
+    days = np.arange(
+        np.datetime64("1995-01-02"), np.datetime64("2035-01-01"), dtype="datetime64[D]"
+    )
+    days = days[np.is_busday(days)][:num_days].astype(str)
+    stats_map = {}
+    for i in range(num_symbols):
+        keep = rng.random(num_days) > missing
+        closes = 100 * np.cumprod(1 + rng.normal(0.0003, 0.012, num_days))
+        stats_map[f"S{i}"] = SymbolStats(
+            f"S{i}", days[keep].tolist(), closes[keep].tolist()
+        )
+    return stats_map
+
+
+def legacy_portfolio_series(holdings, stats_map, base_amount, dates):
+    """Per-date, per-symbol dict lookups used by the original series builder."""
+    all_dates = set()
+    for symbol in stats_map:
+        all_dates.update(dates[symbol])
+    shares, prices = {}, {}
+    for h in holdings:
+        stats = stats_map[h["symbol"]]
+        shares[h["symbol"]] = base_amount * h["allocation"] / 100 / stats.closes[0]
+        prices[h["symbol"]] = dict(zip(dates[h["symbol"]], stats.closes.tolist()))
+    out = []
+    for d in sorted(all_dates):
+        total = 0.0
+        for sym, n in shares.items():
+            price = prices[sym].get(d)
+            if price:
+                total += n * price
+        if total > 0:
+            out.append((d, round(total, 2)))
+    return out
+
+
+def bench_portfolio_series():
+    """Portfolio value series: dict lookups vs aligned price matrix @ shares."""
+    print("Stress test portfolio series, 30 years x 50 symbols")
+    stats_map = synthetic_histories(30 * 252, 50)
+    holdings = [{"symbol": s, "allocation": 2.0} for s in stats_map]
+    # The original series builder worked on ISO date strings
+    dates = {s: stats.days.astype(str).tolist() for s, stats in stats_map.items()}
+    legacy = time_call(
+        lambda: legacy_portfolio_series(holdings, stats_map, BASE_AMOUNT, dates), 1
+    )
+    aligned = time_call(
+        lambda: stress_test_service._compute_portfolio_series(
+            holdings, stats_map, BASE_AMOUNT
+        )
+    )
+    print(
+        f"  legacy {legacy * 1000:8.1f} ms | aligned {aligned * 1000:7.1f} ms | "
+        f"speedup {legacy / aligned:6.1f}x"
+    )
+
+
+def legacy_series_analytics(series):
+    """Per-point drawdown and volatility loops over ChartDataPoint objects."""
+    peak, max_dd, out = series[0].value, 0.0, []
+    for pt in series:
+        peak = max(peak, pt.value)
+        drawdown = (pt.value - peak) / peak * 100.0
+        max_dd = min(max_dd, drawdown)
+        out.append(
+            DrawdownDataPoint(
+                date=pt.date,
+                drawdown=round(drawdown, 4),
+                peak=round(peak, 2),
+                value=pt.value,
+            )
+        )
+    rets = [(b.value - a.value) / a.value for a, b in zip(series, series[1:])]
+    mean = sum(rets) / len(rets)
+    std = (sum((r - mean) ** 2 for r in rets) / len(rets)) ** 0.5
+    return out, max_dd, std * len(rets) ** 0.5
+
+
+def bench_series_analytics():
+    """Drawdown/volatility metrics: per-point loops vs vectorized analytics."""
+    print("Stress test analytics, 30 years of daily values")
+    values = np.round(
+        BASE_AMOUNT
+        * np.cumprod(1 + np.random.default_rng(1).normal(0.0003, 0.012, 7560)),
+        2,
+    )
+    dates = [str(d) for d in np.arange(7560).astype("datetime64[D]")]
+    series = [ChartDataPoint(date=d, value=v) for d, v in zip(dates, values.tolist())]
+    legacy = time_call(lambda: legacy_series_analytics(series))
+    vectorized = time_call(lambda: SeriesAnalytics(values, 30 * 365))
+    print(
+        f"  legacy {legacy * 1000:8.1f} ms | vectorized {vectorized * 1000:7.2f} ms | "
+        f"speedup {legacy / vectorized:7.1f}x"
+    )
+
+
+def encode_binary_histories(stats_map):
+    """Pack histories the way the hub does for ``format=binary``."""
+    parts = []
+    for symbol, stats in stats_map.items():
+        name = symbol.encode("ascii")
+        parts.append(struct.pack("<H", len(name)) + name)
+        parts.append(struct.pack("<I", len(stats.closes)))
+        parts.append(stats.days.astype("<i4").tobytes())
+        parts.append(stats.closes.astype("<f8").tobytes())
+    return b"".join(parts)
+
+
+def bench_history_wire():
+    """History payloads: JSON {date, close} rows vs packed binary columns."""
+    print("History wire format, 30 years x 10 symbols")
+    stats_map = synthetic_histories(30 * 252, 10)
+    rows = json.dumps(
+        {
+            "success": True,
+            "data": {
+                symbol: [
+                    {"date": d, "close": c}
+                    for d, c in zip(
+                        stats.days.astype(str).tolist(), stats.closes.tolist()
+                    )
+                ]
+                for symbol, stats in stats_map.items()
+            },
+        }
+    ).encode()
+    binary = encode_binary_histories(stats_map)
+
+    def parse_rows():
+        for symbol, prices in json.loads(rows)["data"].items():
+            valid = [p for p in prices if p.get("date") and (p.get("close") or 0) > 0]
+            SymbolStats(symbol, [p["date"] for p in valid], [p["close"] for p in valid])
+
+    def parse_binary():
+        for symbol, history in decode_histories(binary).items():
+            valid = history.closes > 0
+            SymbolStats(symbol, history.days[valid], history.closes[valid])
+
+    legacy = time_call(parse_rows)
+    columnar = time_call(parse_binary)
+    print(
+        f"  rows {len(rows) / 1e6:5.2f} MB {legacy * 1000:7.1f} ms | "
+        f"binary {len(binary) / 1e6:5.2f} MB {columnar * 1000:6.2f} ms | "
+        f"size {len(rows) / len(binary):4.1f}x, parse {legacy / columnar:5.1f}x"
+    )
+
+
+def bench_response_serialization():
+    """MAX-range stress test response: response_model path vs FastJSONResponse."""
+    print("Stress test response serialization, 1993-2024 daily x 10 symbols")
+    days = np.arange(
+        np.datetime64("1993-01-29"), np.datetime64("2025-01-01"), dtype="datetime64[D]"
+    )
+    days = days[np.is_busday(days)]
+    rng = np.random.default_rng(11)
+
+    async def fetch_histories(symbols, *args):
+        return {
+            s: PriceHistory(
+                days, 100 * np.cumprod(1 + rng.normal(3e-4, 0.012, len(days)))
+            )
+            for s in symbols
+        }
+
+    params = StressTestParams(
+        portfolio_id=1,
+        mode="historical",
+        historical={"start_date": "1993-01-29", "end_date": "2024-12-31"},
+        holdings=[{"symbol": f"S{i}", "allocation": 10.0} for i in range(10)],
+    )
+    stress_test_service._fetch_histories = fetch_histories
+    try:
+        result = asyncio.run(stress_test_service.run_stress_test(params))
+    finally:
+        del stress_test_service._fetch_histories
+    response = StressTestResponse(success=True, data=result)
+    field = create_model_field(
+        name="Response_stress_test", type_=StressTestResponse, mode="serialization"
+    )
+    gzip_request = Request({"type": "http", "headers": [(b"accept-encoding", b"gzip")]})
+
+    async def validated():
+        content = await serialize_response(
+            field=field, response_content=response, is_coroutine=True
+        )
+        return JSONResponse(content).body
+
+    loop = asyncio.new_event_loop()
+    legacy = time_call(lambda: loop.run_until_complete(validated()), 10)
+    loop.close()
+    fast = time_call(lambda: FastJSONResponse(response).body, 10)
+    gzipped = time_call(lambda: FastJSONResponse(response, gzip_request).body, 10)
+    size = len(FastJSONResponse(response).body)
+    gzip_size = len(FastJSONResponse(response, gzip_request).body)
+    print(
+        f"  response_model {legacy * 1000:6.1f} ms | fast {fast * 1000:5.1f} ms "
+        f"({legacy / fast:4.1f}x) | fast+gzip {gzipped * 1000:5.1f} ms | "
+        f"{size / 1e6:4.2f} MB -> {gzip_size / 1e6:4.2f} MB"
+    )
+
+
+def main():
+    """Run all benchmarks."""
+    bench_final_values()
+    bench_projections()
+    bench_bit_generators()
+    bench_variance_reduction()
+    bench_portfolio_series()
+    bench_series_analytics()
+    bench_history_wire()
+    bench_response_serialization()
+    bench_worker_scaling()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -10,12 +10,27 @@ CORS_ORIGINS: List[str] = ["*"]
 
 # Cache settings
 CACHE_DURATION = 300  # 5 minutes
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+# Per-symbol return statistics only change once per trading day
+SYMBOL_STATS_CACHE_SIZE = int(os.getenv("SYMBOL_STATS_CACHE_SIZE", "2048"))
+SYMBOL_STATS_TTL = 24 * 60 * 60
 
 # API settings
 MAX_BATCH_SIZE = 10
 MIN_QUERY_LENGTH = 2
 DEFAULT_SEARCH_LIMIT = 10
 
+# Response settings
+# Fast JSON responses are gzipped from this many bytes when the client
+# accepts it; level 1 trades a slightly larger body for far less CPU
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "1"))
+
+# Observability settings
+# Per-stage latency histograms served on /metrics; disabled, timers are no-ops
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+
 # Server settings
 HOST = "0.0.0.0" if IS_PRODUCTION else "127.0.0.1"
 PORT = int(os.getenv("PORT", "8002"))
@@ -23,6 +38,61 @@ PORT = int(os.getenv("PORT", "8002"))
 # Hub (server) URL
 HUB_URL = os.getenv("MONTY_SERVER_URL", "http://127.0.0.1:3001")
 API_PREFIX = "/api/v1"
+# Pooled hub connections: total and per-host socket limits, idle keep-alive
+# and DNS cache lifetimes in seconds, and concurrent in-flight requests
+HUB_POOL_LIMIT = int(os.getenv("HUB_POOL_LIMIT", "100"))
+HUB_POOL_LIMIT_PER_HOST = int(os.getenv("HUB_POOL_LIMIT_PER_HOST", "20"))
+HUB_KEEPALIVE_TIMEOUT = float(os.getenv("HUB_KEEPALIVE_TIMEOUT", "30"))
+HUB_DNS_CACHE_TTL = int(os.getenv("HUB_DNS_CACHE_TTL", "300"))
+HUB_MAX_CONCURRENT_REQUESTS = int(os.getenv("HUB_MAX_CONCURRENT_REQUESTS", "16"))
+HUB_REQUEST_TIMEOUT = float(os.getenv("HUB_REQUEST_TIMEOUT", "10"))
 
 # Portfolio simulation settings
 BASE_PORTFOLIO_AMOUNT = float(os.getenv("BASE_PORTFOLIO_AMOUNT", "10000.0"))
+
+# Stress test settings
+# Rows a missing close is carried forward over ("none" for no limit, 0 disables)
+_forward_fill = os.getenv("STRESS_TEST_FORWARD_FILL", "5")
+STRESS_TEST_FORWARD_FILL = (
+    None if _forward_fill.lower() == "none" else int(_forward_fill)
+)
+
+# Crisis scenario windows: cached per (scenario, symbol), preloaded for
+# common tickers at startup, with a recovery tail after each window
+SCENARIO_CACHE_SIZE = int(os.getenv("SCENARIO_CACHE_SIZE", "4096"))
+SCENARIO_CACHE_TTL = 7 * 24 * 60 * 60
+# Windows the hub returned no history for (e.g. tickers listed later) are
+# cached as empty slices for this long
+SCENARIO_MISSING_TTL = int(os.getenv("SCENARIO_MISSING_TTL", str(6 * 60 * 60)))
+SCENARIO_RECOVERY_DAYS = 3 * 365
+SCENARIO_PRELOAD_SYMBOLS = [
+    s.strip().upper()
+    for s in os.getenv(
+        "SCENARIO_PRELOAD_SYMBOLS",
+        "SPY,QQQ,DIA,IWM,VTI,TLT,GLD,AAPL,MSFT,AMZN,GOOGL,META,NVDA,JPM,BRK-B",
+    ).split(",")
+    if s.strip()
+]
+
+# Monte Carlo settings
+# Runs larger than one chunk are streamed through bounded-memory accumulators,
+# with chunks spread over the worker pool; kept small so typical requests
+# (10,000 simulations in the client) use more than one core
+MONTE_CARLO_CHUNK_SIZE = int(os.getenv("MONTE_CARLO_CHUNK_SIZE", "2500"))
+MONTE_CARLO_MAX_SIMULATIONS = int(os.getenv("MONTE_CARLO_MAX_SIMULATIONS", "10000000"))
+# Worker processes used for simulations (defaults to one per CPU core)
+MONTE_CARLO_WORKERS = max(
+    1, int(os.getenv("MONTE_CARLO_WORKERS", str(os.cpu_count() or 1)))
+)
+# Default root seed for the per-chunk SeedSequence streams
+MONTE_CARLO_SEED = 42
+# Block length in trading days for the historical bootstrap (about one month)
+BOOTSTRAP_BLOCK_LENGTH = int(os.getenv("BOOTSTRAP_BLOCK_LENGTH", "21"))
+# Batch runs: portfolios per request and (simulations x steps) cells in the
+# shared shock matrix
+MONTE_CARLO_BATCH_MAX_PORTFOLIOS = int(
+    os.getenv("MONTE_CARLO_BATCH_MAX_PORTFOLIOS", "5000")
+)
+MONTE_CARLO_BATCH_MAX_CELLS = int(os.getenv("MONTE_CARLO_BATCH_MAX_CELLS", "25000000"))
+# Bit generator behind each Generator: PCG64, PCG64DXSM, Philox or SFC64
+MONTE_CARLO_BIT_GENERATOR = os.getenv("MONTE_CARLO_BIT_GENERATOR", "PCG64")
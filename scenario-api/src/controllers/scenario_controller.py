@@ -1,36 +1,84 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from ..services.stress_test_service import stress_test_service
 from ..services.monte_carlo_service import monte_carlo_service
+from ..services.base_service import history_flight
+from ..services.scenario_library import SCENARIO_EVENTS
+from ..utils.http import hub_session
+from ..utils.metrics import stage_seconds
+from ..utils.responses import FastJSONResponse
 from ..dto.scenario import (
     StressTestParams,
     StressTestResponse,
     MonteCarloParams,
     MonteCarloResponse,
+    MonteCarloBatchParams,
 )
 
 router = APIRouter()
 
 
 @router.post("/stress-test", response_model=StressTestResponse)
-async def run_stress_test(params: StressTestParams):
+async def run_stress_test(params: StressTestParams, request: Request):
     """
     Run stress test analysis on a portfolio.
 
     Supports both historical period analysis and predefined scenario testing.
     """
     result = await stress_test_service.run_stress_test(params)
-    return StressTestResponse(success=True, data=result)
+    with stage_seconds.time("stress_test", "serialization"):
+        return FastJSONResponse(StressTestResponse(success=True, data=result), request)
+
+
+@router.get("/stress-test/scenarios")
+async def list_scenarios():
+    """Built-in crisis scenarios available to scenario-mode stress tests"""
+    return {
+        "success": True,
+        "data": [event.model_dump() for event in SCENARIO_EVENTS.values()],
+    }
 
 
 @router.post("/monte-carlo", response_model=MonteCarloResponse)
-async def run_monte_carlo(params: MonteCarloParams):
+async def run_monte_carlo(params: MonteCarloParams, request: Request):
     """
     Run Monte Carlo simulation on a portfolio.
 
     Generates probabilistic projections based on historical data and correlation patterns.
     """
     result = await monte_carlo_service.run_monte_carlo(params)
-    return MonteCarloResponse(success=True, data=result)
+    with stage_seconds.time("monte_carlo", "serialization"):
+        return FastJSONResponse(MonteCarloResponse(success=True, data=result), request)
+
+
+@router.post("/monte-carlo/batch")
+async def run_monte_carlo_batch(params: MonteCarloBatchParams):
+    """
+    Run Monte Carlo simulations for many portfolios in one call.
+
+    Streams one JSON MonteCarloResponse per line (NDJSON), in request order.
+    """
+    results = await monte_carlo_service.run_monte_carlo_batch(params)
+
+    async def lines():
+        async for response in results:
+            yield response.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the scenario result caches"""
+    return {"success": True, "data": monte_carlo_service.cache_stats()}
+
+
+@router.get("/hub/pool/stats")
+async def hub_pool_stats():
+    """Connection pool and request counters for the hub session"""
+    stats = hub_session.stats()
+    stats["coalescing"] = history_flight.stats()
+    return {"success": True, "data": stats}
 
 
 @router.get("/health")
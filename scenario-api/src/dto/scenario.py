@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 
@@ -58,19 +58,49 @@ class Recovery(BaseModel):
     recovery_date: str
 
 
+# Rolling-window scan params; window and step are in trading days
+class StressScanParams(BaseModel):
+    window: int
+    step: int = 1
+    worst: int = 10
+    rank_by: Literal["return", "max_drawdown", "volatility"] = "return"
+
+
+# Metrics of one rolling window
+class ScanWindow(BaseModel):
+    start_date: str
+    end_date: str
+    total_return: float
+    max_drawdown: float
+    volatility: float
+
+
+# Rolling-window scan result
+class StressScanResult(BaseModel):
+    window: int
+    step: int
+    rank_by: str
+    worst_windows: List[ScanWindow]
+    curve: List[ScanWindow]
+
+
 # Stress test params
 class StressTestParams(BaseModel):
     portfolio_id: int
-    mode: Literal["historical", "scenario"]
+    mode: Literal["historical", "scenario", "scan"]
     historical: Optional[Dict[str, str]] = None
     scenario: Optional[Dict[str, str]] = None
+    # Scan mode slides a window over the historical date range
+    scan: Optional[StressScanParams] = None
     # Optional holdings payload provided by hub for deterministic calculations
     holdings: Optional[List[Dict[str, Any]]] = None
+    # Downsample chart series to at most this many points; metrics stay exact
+    max_points: Optional[int] = Field(None, ge=10)
 
 
 # Stress test result
 class StressTestResult(BaseModel):
-    mode: Literal["historical", "scenario"]
+    mode: Literal["historical", "scenario", "scan"]
     time_range: Dict[str, str]
     portfolio: Portfolio
     metrics: PortfolioMetrics
@@ -78,6 +108,7 @@ class StressTestResult(BaseModel):
     drawdown_data: List[DrawdownDataPoint]
     recovery: Optional[Recovery] = None
     scenario: Optional[ScenarioEvent] = None
+    scan: Optional[StressScanResult] = None
 
 
 # Monte Carlo params
@@ -88,6 +119,35 @@ class MonteCarloParams(BaseModel):
     confidence_interval: int
     # Optional holdings payload provided by hub for deterministic calculations
     holdings: Optional[List[Dict[str, Any]]] = None
+    # "correlated" uses the full covariance matrix of aligned daily returns,
+    # "bootstrap" resamples blocks of historical daily portfolio returns
+    mode: Literal["independent", "correlated", "bootstrap"] = "independent"
+    # Root seed for reproducible simulations; defaults to a fixed server seed
+    seed: Optional[int] = None
+    # Variance reduction for the normal modes: antithetic pairs, a control
+    # variate on the analytic mean, or scrambled Sobol quasi-random normals
+    variance_reduction: Literal["none", "antithetic", "control_variate", "sobol"] = (
+        "none"
+    )
+    # Downsample projection series to at most this many points
+    max_points: Optional[int] = Field(None, ge=10)
+
+
+# Portfolio entry in a batch Monte Carlo request
+class MonteCarloBatchPortfolio(BaseModel):
+    portfolio_id: int
+    holdings: List[Dict[str, Any]]
+
+
+# Batch Monte Carlo params; every portfolio is simulated over the same
+# correlated per-asset shocks
+class MonteCarloBatchParams(BaseModel):
+    portfolios: List[MonteCarloBatchPortfolio]
+    time_horizon: int
+    simulations: int
+    confidence_interval: int
+    seed: Optional[int] = None
+    max_points: Optional[int] = Field(None, ge=10)
 
 
 # Monte Carlo projections
@@ -99,6 +159,17 @@ class MonteCarloProjections(BaseModel):
     percentile95: List[ChartDataPoint]
 
 
+# Monte Carlo standard errors of the reported outcomes, in the same units;
+# percentile errors are omitted for runs too small to split into batches
+class OutcomeStandardErrors(BaseModel):
+    best_case: Optional[float] = None
+    worst_case: Optional[float] = None
+    median: Optional[float] = None
+    probability_of_profit: Optional[float] = None
+    probability_of_doubling: Optional[float] = None
+    expected_value: Optional[float] = None
+
+
 # Monte Carlo outcomes
 class MonteCarloOutcomes(BaseModel):
     best_case: float
@@ -106,6 +177,9 @@ class MonteCarloOutcomes(BaseModel):
     median: float
     probability_of_profit: float
     probability_of_doubling: float
+    # Estimated mean final value
+    expected_value: Optional[float] = None
+    standard_error: Optional[OutcomeStandardErrors] = None
 
 
 # Distribution data
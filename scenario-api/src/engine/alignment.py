@@ -0,0 +1,54 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def aligned_price_matrix(
+    dates: Sequence[np.ndarray],
+    closes: Sequence[Sequence[float]],
+    forward_fill: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Align per-asset close series on the union of their dates.
+
+    Args:
+        dates: Per-asset price dates (datetime64 or ISO strings, ascending)
+        closes: Per-asset closes, parallel to ``dates``
+        forward_fill: Carry the last close over at most this many missing
+            rows; ``None`` fills without limit and ``0`` disables filling
+
+    Returns:
+        (union dates, array of shape (dates, assets)); cells without a price
+        (before an asset's first close or beyond the fill limit) are NaN
+    """
+    date_arrays = [np.asarray(d) for d in dates]
+    if not date_arrays or not any(len(d) for d in date_arrays):
+        return np.empty(0, dtype="datetime64[D]"), np.empty((0, len(date_arrays)))
+
+    union = np.unique(np.concatenate(date_arrays))
+    prices = np.full((len(union), len(date_arrays)), np.nan)
+    for column, (d, c) in enumerate(zip(date_arrays, closes)):
+        prices[np.searchsorted(union, d), column] = c
+
+    if forward_fill != 0:
+        forward_fill_nan(prices, forward_fill)
+    return union, prices
+
+
+def forward_fill_nan(values: np.ndarray, limit: Optional[int] = None) -> None:
+    """
+    Forward-fill NaNs down each column in place.
+
+    Args:
+        values: Array of shape (rows, columns)
+        limit: Maximum number of consecutive rows to fill, ``None`` for no limit
+    """
+    rows = np.arange(len(values))[:, None]
+    # Row of the latest observation at or before each row
+    last_valid = np.where(np.isnan(values), 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+
+    filled = values[last_valid, np.arange(values.shape[1])]
+    if limit is not None:
+        filled[rows - last_valid > limit] = np.nan
+    values[:] = filled
@@ -0,0 +1,103 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def running_drawdowns(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Running peak and percentage drawdown from it for a value series.
+
+    Returns:
+        (peaks, drawdowns) arrays shaped like ``values``; drawdowns are <= 0
+    """
+    peaks = np.maximum.accumulate(values)
+    drawdowns = np.zeros_like(values, dtype=float)
+    np.divide(values - peaks, peaks, out=drawdowns, where=peaks != 0)
+    drawdowns *= 100.0
+    return peaks, drawdowns
+
+
+def simple_returns(values: np.ndarray) -> np.ndarray:
+    """Period-over-period returns, skipping steps that start or end at zero."""
+    prev, cur = values[:-1], values[1:]
+    valid = (prev > 0) & (cur > 0)
+    return cur[valid] / prev[valid] - 1
+
+
+def period_volatility(returns: np.ndarray) -> float:
+    """Standard deviation of returns scaled by sqrt(N) to cover the whole period."""
+    if not len(returns):
+        return 0.0
+    return float(np.std(returns) * np.sqrt(len(returns)))
+
+
+def annualized_return(total_return: float, days: int) -> float:
+    """Convert a total return over ``days`` calendar days to an annual rate."""
+    years = max(days, 1) / 365.0
+    return math.pow(1 + total_return, 1 / years) - 1
+
+
+def recovery_point(
+    values: np.ndarray,
+    peaks: np.ndarray,
+    drawdowns: np.ndarray,
+    trough_within: Optional[int] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    Trough of the maximum drawdown and the first point back at its prior peak.
+
+    Args:
+        trough_within: Only look for the trough in the first this many points;
+            the recovery itself may come later in the series
+
+    Returns:
+        (trough index, recovery index), or None when there was no drawdown or
+        the series never regained the peak
+    """
+    if not len(values):
+        return None
+    trough = int(np.argmin(drawdowns[:trough_within]))
+    if drawdowns[trough] >= 0:
+        return None
+    recovered = np.flatnonzero(values[trough:] >= peaks[trough])
+    if not len(recovered):
+        return None
+    return trough, trough + int(recovered[0])
+
+
+class SeriesAnalytics:
+    """Drawdown, return and risk metrics for one portfolio value series."""
+
+    __slots__ = (
+        "peaks",
+        "drawdowns",
+        "max_drawdown",
+        "total_return",
+        "annualized_return",
+        "volatility",
+        "sharpe_ratio",
+        "calmar_ratio",
+        "recovery",
+    )
+
+    def __init__(self, values: np.ndarray, period_days: int):
+        """
+        Args:
+            values: Portfolio values in date order, at least one point
+            period_days: Calendar days covered, used to annualize the return
+        """
+        self.peaks, self.drawdowns = running_drawdowns(values)
+        self.max_drawdown = float(min(self.drawdowns.min(), 0.0))
+        self.total_return = float((values[-1] - values[0]) / values[0])
+        self.annualized_return = annualized_return(self.total_return, period_days)
+        self.volatility = period_volatility(simple_returns(values))
+        self.sharpe_ratio = (
+            self.annualized_return / self.volatility if self.volatility > 0 else 0.0
+        )
+        self.calmar_ratio = (
+            self.annualized_return / abs(self.max_drawdown / 100.0)
+            if self.max_drawdown != 0
+            else 0.0
+        )
+        self.recovery = recovery_point(values, self.peaks, self.drawdowns)
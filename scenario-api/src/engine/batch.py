@@ -0,0 +1,114 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .monte_carlo import PROJECTION_PERCENTILES
+from .rng import make_generator, spawn_seeds
+from .streaming import iter_chunks
+from .variance import fill_standard_normals
+
+# Upper bound on (portfolios x simulations x steps) cells materialized per group
+BATCH_GROUP_CELLS = 8_000_000
+
+
+def sorted_percentiles(values: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """
+    Linear-interpolated percentiles of values sorted along the last axis.
+
+    Matches ``np.percentile(..., axis=-1)``; one sort is much cheaper than
+    the repeated partitions np.percentile does for many small rows.
+
+    Returns:
+        Array of shape (len(percentiles),) + values.shape[:-1]
+    """
+    n = values.shape[-1]
+    position = np.asarray(percentiles, dtype=float) / 100 * (n - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, n - 1)
+    fraction = position - lower
+    out = values[..., lower] * (1 - fraction) + values[..., upper] * fraction
+    return np.moveaxis(out, -1, 0)
+
+
+class SharedNormalPaths:
+    """
+    Standard normal path shocks shared by every portfolio in a batch.
+
+    Shocks are drawn once, chunk by chunk from the same child seeds and in
+    the same layout as a single normal-mode simulation, so each portfolio
+    sees exactly the draws a single run with the same seed would. A
+    portfolio's paths are its own drift and volatility applied to those
+    shocks, so a whole group of portfolios is one broadcast. Shocks are
+    stored step-major so each portfolio's paths come out as contiguous
+    (steps x simulations) blocks.
+    """
+
+    def __init__(
+        self,
+        time_points: np.ndarray,
+        base_amount: float,
+        num_sims: int,
+        seed: int,
+        chunk_size: int,
+    ):
+        shocks = np.empty((num_sims, len(time_points)))
+        sizes = list(iter_chunks(num_sims, chunk_size))
+        start = 0
+        for size, seed_seq in zip(sizes, spawn_seeds(seed, len(sizes))):
+            fill_standard_normals(
+                make_generator(seed_seq), shocks[start : start + size]
+            )
+            start += size
+        # Column 0 is the zero starting return, as in simulate_paths
+        self.shocks = np.ascontiguousarray(shocks[:, 1:].T)
+        self.dt = np.diff(time_points)
+        self.num_sims = num_sims
+        self.num_steps = len(time_points)
+        self.base_amount = base_amount
+
+    def group_size(self) -> int:
+        """Portfolios that can be simulated together within the cell budget."""
+        return max(1, BATCH_GROUP_CELLS // (self.num_sims * self.num_steps))
+
+    def portfolio_paths(
+        self, portfolio_returns: np.ndarray, portfolio_vols: np.ndarray
+    ) -> np.ndarray:
+        """Value paths for a group of portfolios' annualized moments.
+
+        Returns:
+            Array of shape (portfolios, steps, num_sims) floored at zero
+        """
+        num_portfolios = len(portfolio_returns)
+        paths = np.empty((num_portfolios, self.num_steps, self.num_sims))
+        paths[:, 0] = 0.0
+        # Same operations, in the same order, as simulate_paths
+        increments = paths[:, 1:]
+        np.multiply(
+            self.shocks,
+            (portfolio_vols[:, None] * np.sqrt(self.dt))[:, :, None],
+            out=increments,
+        )
+        increments += (portfolio_returns[:, None] * self.dt)[:, :, None]
+        np.cumsum(paths, axis=1, out=paths)
+        paths *= self.base_amount
+        paths += self.base_amount
+        np.maximum(paths, 0, out=paths)  # Prevent negative values
+        return paths
+
+    def summarize(
+        self,
+        portfolio_returns: np.ndarray,
+        portfolio_vols: np.ndarray,
+        percentiles: Sequence[float] = PROJECTION_PERCENTILES,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Percentile bands and final values for a group of portfolios.
+
+        Returns:
+            (bands of shape (len(percentiles), portfolios, steps),
+            final values of shape (portfolios, num_sims))
+        """
+        paths = self.portfolio_paths(portfolio_returns, portfolio_vols)
+        final_values = paths[:, -1].copy()
+        paths.sort(axis=2)
+        return sorted_percentiles(paths, percentiles), final_values
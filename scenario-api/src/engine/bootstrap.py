@@ -0,0 +1,76 @@
+from typing import Optional
+
+import numpy as np
+
+from ..config.settings import BOOTSTRAP_BLOCK_LENGTH
+from .variance import OutcomeEstimator
+
+TRADING_DAYS = 252
+
+# Upper bound on (paths x blocks) cells materialized at once per simulate call
+MAX_BLOCK_CELLS = 4_000_000
+
+
+class BlockBootstrapPathModel:
+    """
+    Picklable circular block-bootstrap model over historical daily returns.
+
+    Each path is a sequence of blocks of consecutive historical days with
+    random start indices. Cumulative log returns are taken from a prefix-sum
+    table, so a block costs O(1) regardless of its length and only the
+    projection time points are ever materialized.
+    """
+
+    def __init__(
+        self,
+        daily_returns: np.ndarray,
+        time_points: np.ndarray,
+        base_amount: float,
+        block_length: int = BOOTSTRAP_BLOCK_LENGTH,
+    ):
+        log_returns = np.log1p(np.maximum(np.asarray(daily_returns, float), -0.999999))
+        self.history_length = len(log_returns)
+        self.block_length = max(1, min(block_length, self.history_length))
+        # Wrap the history so blocks starting near the end continue at the start
+        extended = np.concatenate([log_returns, log_returns[: self.block_length]])
+        self.prefix = np.concatenate([[0.0], np.cumsum(extended)])
+
+        day_index = np.rint(np.asarray(time_points) * TRADING_DAYS).astype(np.int64)
+        self.point_block = day_index // self.block_length
+        self.point_offset = day_index % self.block_length
+        self.num_blocks = int(self.point_block[-1]) + 1 if len(day_index) else 0
+        self.base_amount = base_amount
+
+    def simulate(
+        self,
+        rng: np.random.Generator,
+        num_sims: int,
+        estimator: Optional[OutcomeEstimator] = None,
+    ) -> np.ndarray:
+        """Simulate a (num_sims x steps) block of value paths."""
+        paths = np.empty((num_sims, len(self.point_block)))
+        rows = max(1, MAX_BLOCK_CELLS // max(self.num_blocks, 1))
+        for start in range(0, num_sims, rows):
+            stop = min(start + rows, num_sims)
+            paths[start:stop] = self._simulate_rows(rng, stop - start)
+        if estimator is not None:
+            estimator.update(paths[:, -1])
+        return paths
+
+    def _simulate_rows(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        starts = rng.integers(0, self.history_length, size=(size, self.num_blocks))
+        block_sums = self.prefix[starts + self.block_length] - self.prefix[starts]
+
+        # Cumulative log return at the start of every block
+        block_cum = np.zeros((size, self.num_blocks))
+        np.cumsum(block_sums[:, :-1], axis=1, out=block_cum[:, 1:])
+
+        # Add the partial block up to each time point
+        point_starts = starts[:, self.point_block]
+        cum = block_cum[:, self.point_block]
+        cum += self.prefix[point_starts + self.point_offset]
+        cum -= self.prefix[point_starts]
+
+        np.exp(cum, out=cum)
+        cum *= self.base_amount
+        return cum
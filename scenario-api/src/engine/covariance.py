@@ -0,0 +1,63 @@
+from typing import List, Sequence
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def aligned_return_matrix(
+    dates: Sequence[Sequence], returns: Sequence[Sequence[float]]
+) -> np.ndarray:
+    """
+    Align per-asset daily return series on their common dates.
+
+    Args:
+        dates: Per-asset return dates (datetime64 or ISO strings, ascending)
+        returns: Per-asset daily returns, parallel to ``dates``
+
+    Returns:
+        Array of shape (common_dates, assets), rows in chronological order
+    """
+    date_arrays = [np.asarray(d) for d in dates]
+    common = date_arrays[0]
+    for d in date_arrays[1:]:
+        common = np.intersect1d(common, d, assume_unique=True)
+
+    columns: List[np.ndarray] = []
+    for d, r in zip(date_arrays, returns):
+        _, _, idx = np.intersect1d(common, d, assume_unique=True, return_indices=True)
+        columns.append(np.asarray(r, dtype=float)[idx])
+    if not columns:
+        return np.empty((0, 0))
+    return np.column_stack(columns)
+
+
+def annualized_covariance(aligned_returns: np.ndarray) -> np.ndarray:
+    """Annualized covariance matrix of aligned daily returns."""
+    cov = np.cov(aligned_returns, rowvar=False, ddof=0) * TRADING_DAYS
+    return np.atleast_2d(cov)
+
+
+def cholesky_factor(cov: np.ndarray) -> np.ndarray:
+    """
+    Factor L with L @ L.T == cov, via Cholesky where possible.
+
+    Sample covariances of short or collinear histories can be singular, so a
+    growing diagonal jitter is added until the factorization succeeds.
+    """
+    jitter = 0.0
+    scale = float(np.mean(np.diag(cov))) or 1.0
+    identity = np.eye(len(cov))
+    for _ in range(10):
+        try:
+            return np.linalg.cholesky(cov + jitter * identity)
+        except np.linalg.LinAlgError:
+            jitter = scale * 1e-10 if jitter == 0.0 else jitter * 10
+    # Fall back to clipping negative eigenvalues
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    return eigvecs * np.sqrt(np.clip(eigvals, 0, None))
+
+
+def portfolio_volatility(weights: np.ndarray, chol: np.ndarray) -> float:
+    """Portfolio volatility sqrt(w' S w) computed as the norm of L' w."""
+    return float(np.linalg.norm(chol.T @ weights))
@@ -0,0 +1,90 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, num_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection of chart points.
+
+    The first and last points are kept; the points between are split into
+    ``num_points - 2`` equal buckets and from each bucket the point forming
+    the largest triangle with the previously chosen point and the mean of
+    the next bucket is kept. Bucket means come from prefix sums and every
+    bucket's candidates are scored in one array operation, so the only
+    Python loop is over the output points.
+
+    Args:
+        x: Increasing x coordinates (e.g. day numbers)
+        y: Values parallel to ``x``
+        num_points: Points to keep, at least 2
+
+    Returns:
+        Increasing indices into ``x``/``y``; all indices when the series
+        already has at most ``num_points`` points
+    """
+    n = len(y)
+    if num_points >= n:
+        return np.arange(n)
+    if num_points <= 2:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    num_buckets = num_points - 2
+    edges = np.linspace(1, n - 1, num_buckets + 1).astype(np.int64)
+
+    # Mean of each bucket; the last bucket looks ahead to the final point
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = np.diff(edges)
+    mean_x = np.append((cx[edges[1:]] - cx[edges[:-1]]) / sizes, x[-1])
+    mean_y = np.append((cy[edges[1:]] - cy[edges[:-1]]) / sizes, y[-1])
+
+    selected = np.empty(num_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    ax, ay = x[0], y[0]
+    for bucket in range(num_buckets):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        bx, by = mean_x[bucket + 1], mean_y[bucket + 1]
+        # Twice the triangle area, expanded to be linear in the candidate
+        area = np.abs((ax - bx) * y[lo:hi] + (by - ay) * x[lo:hi] + (bx * ay - ax * by))
+        chosen = lo + int(np.argmax(area))
+        selected[bucket + 1] = chosen
+        ax, ay = x[chosen], y[chosen]
+    return selected
+
+
+def downsample_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: Optional[int],
+    keep: Sequence[int] = (),
+) -> np.ndarray:
+    """
+    Indices of at most ``max_points`` chart points, including ``keep``.
+
+    Points that must survive (drawdown peaks and troughs, recovery dates)
+    are passed as ``keep`` in priority order; LTTB fills the remaining
+    budget. When ``keep`` alone exceeds the budget, the lowest-priority
+    points are dropped so the result never has more than ``max_points``.
+
+    Args:
+        x: Increasing x coordinates
+        y: Values parallel to ``x``
+        max_points: Point budget of at least 2, ``None`` for no downsampling
+        keep: Indices to include, most important first
+
+    Returns:
+        Increasing, unique indices
+    """
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    keep = np.asarray(keep, dtype=np.int64)
+    # The endpoints are always selected, so only interior points use budget
+    keep = keep[(keep > 0) & (keep < n - 1)]
+    _, first = np.unique(keep, return_index=True)
+    keep = keep[np.sort(first)][: max_points - 2]
+    selected = lttb_indices(x, y, max_points - len(keep))
+    return np.union1d(selected, keep)
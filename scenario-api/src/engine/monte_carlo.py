@@ -0,0 +1,125 @@
+from typing import Optional
+
+import numpy as np
+
+from .variance import OutcomeEstimator, fill_standard_normals
+
+# Percentile bands reported in projections
+PROJECTION_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def projection_time_points(time_horizon: int) -> np.ndarray:
+    """Monthly time grid in years, capped at 5 years of monthly points."""
+    months = min(time_horizon * 12, 60)
+    return np.linspace(0, time_horizon, months)
+
+
+def simulate_paths(
+    portfolio_return: float,
+    portfolio_vol: float,
+    time_points: np.ndarray,
+    num_sims: int,
+    base_amount: float,
+    rng: np.random.Generator,
+    variance_reduction: str = "none",
+    control_out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Simulate coherent portfolio value paths over a time grid.
+
+    Normal increments are drawn once for every (simulation, step) pair and
+    cumulated along the time axis, so the value at each time point has the
+    same N(mu * t, sigma * sqrt(t)) return distribution as an independent
+    draw while every row stays a single consistent path.
+
+    Args:
+        portfolio_return: Annualized expected portfolio return
+        portfolio_vol: Annualized portfolio volatility
+        time_points: Increasing time grid in years, starting at 0
+        num_sims: Number of paths to simulate
+        base_amount: Starting portfolio value
+        rng: Request-local random generator
+        variance_reduction: How normals are drawn, see ``fill_standard_normals``
+        control_out: Optional buffer that receives the unfloored final values
+            minus their analytic mean, the control for exceedance probabilities
+
+    Returns:
+        Array of shape (num_sims, len(time_points)) with values floored at zero
+    """
+    dt = np.diff(time_points)
+    paths = np.empty((num_sims, len(time_points)))
+
+    # Fill the buffer with standard normals, then turn columns 1.. into
+    # scaled increments and column 0 into the zero starting return
+    if variance_reduction == "sobol":
+        # Quasi-random points need exactly one dimension per increment
+        fill_standard_normals(rng, paths[:, 1:], variance_reduction)
+    else:
+        fill_standard_normals(rng, paths, variance_reduction)
+    paths[:, 1:] *= portfolio_vol * np.sqrt(dt)
+    paths[:, 1:] += portfolio_return * dt
+    paths[:, 0] = 0.0
+    np.cumsum(paths, axis=1, out=paths)
+
+    if control_out is not None:
+        expected = portfolio_return * (time_points[-1] - time_points[0])
+        np.subtract(paths[:, -1], expected, out=control_out)
+        control_out *= base_amount
+
+    # Convert cumulative returns to values in place
+    paths *= base_amount
+    paths += base_amount
+    np.maximum(paths, 0, out=paths)  # Prevent negative values
+    return paths
+
+
+def path_percentiles(paths: np.ndarray, percentiles=PROJECTION_PERCENTILES):
+    """Percentile bands across simulations for every time point."""
+    return np.percentile(paths, percentiles, axis=0)
+
+
+class NormalPathModel:
+    """Picklable normal-return path model that worker processes can simulate."""
+
+    def __init__(
+        self,
+        portfolio_return: float,
+        portfolio_vol: float,
+        time_points: np.ndarray,
+        base_amount: float,
+        variance_reduction: str = "none",
+    ):
+        self.portfolio_return = portfolio_return
+        self.portfolio_vol = portfolio_vol
+        self.time_points = time_points
+        self.base_amount = base_amount
+        self.variance_reduction = variance_reduction
+
+    def simulate(
+        self,
+        rng: np.random.Generator,
+        num_sims: int,
+        estimator: Optional[OutcomeEstimator] = None,
+    ) -> np.ndarray:
+        """Simulate a (num_sims x steps) block of value paths.
+
+        When an estimator is given it is updated with this block's
+        contribution to the outcome estimates and their standard errors.
+        """
+        use_control = (
+            estimator is not None and self.variance_reduction == "control_variate"
+        )
+        control = np.empty(num_sims) if use_control else None
+        paths = simulate_paths(
+            self.portfolio_return,
+            self.portfolio_vol,
+            self.time_points,
+            num_sims,
+            self.base_amount,
+            rng,
+            self.variance_reduction,
+            control,
+        )
+        if estimator is not None:
+            estimator.update(paths[:, -1], self.variance_reduction, control)
+        return paths
@@ -0,0 +1,130 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import MONTE_CARLO_WORKERS
+from .monte_carlo import path_percentiles
+from .rng import make_generator, spawn_seeds
+from .streaming import PathAccumulator, iter_chunks
+from .variance import OutcomeEstimator
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared simulation process pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MONTE_CARLO_WORKERS)
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the simulation process pool if it was started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def _simulate_exact(
+    model, num_sims: int, seed_seq: np.random.SeedSequence
+) -> Tuple[np.ndarray, np.ndarray, OutcomeEstimator]:
+    """Worker: simulate all paths at once, return bands, final values and outcome estimates."""
+    estimator = OutcomeEstimator(model.base_amount)
+    paths = model.simulate(make_generator(seed_seq), num_sims, estimator)
+    return path_percentiles(paths), paths[:, -1].copy(), estimator
+
+
+def _simulate_pilot(
+    model, num_sims: int, seed_seq: np.random.SeedSequence
+) -> PathAccumulator:
+    """Worker: simulate the first chunk and fix the accumulator bin ranges from it."""
+    estimator = OutcomeEstimator(model.base_amount)
+    paths = model.simulate(make_generator(seed_seq), num_sims, estimator)
+    accumulator = PathAccumulator.from_pilot(paths, model.base_amount)
+    accumulator.update(paths)
+    accumulator.estimator = estimator
+    return accumulator
+
+
+def _simulate_chunks(
+    model,
+    chunks: List[Tuple[int, np.random.SeedSequence]],
+    lo: np.ndarray,
+    hi: np.ndarray,
+) -> PathAccumulator:
+    """Worker: simulate a group of chunks into one accumulator."""
+    accumulator = PathAccumulator(lo, hi, model.base_amount)
+    for size, seed_seq in chunks:
+        paths = model.simulate(make_generator(seed_seq), size, accumulator.estimator)
+        accumulator.update(paths)
+    return accumulator
+
+
+async def run_exact(
+    model, num_sims: int, seed: int
+) -> Tuple[np.ndarray, np.ndarray, OutcomeEstimator]:
+    """
+    Simulate every path in a single worker process.
+
+    Exact runs are not sharded: the percentile bands need every path, so
+    shards would pickle the whole (sims x days) matrix back to this process.
+    Only runs of at most one chunk (MONTE_CARLO_CHUNK_SIZE) take this path;
+    anything larger goes through :func:`run_streaming`, whose workers return
+    merged quantile sketches instead of paths.
+
+    Returns:
+        (percentile bands, final values, outcome estimator) for the full simulation
+    """
+    loop = asyncio.get_running_loop()
+    seed_seq = spawn_seeds(seed, 1)[0]
+    return await loop.run_in_executor(
+        get_process_pool(), _simulate_exact, model, num_sims, seed_seq
+    )
+
+
+async def run_streaming(
+    model, num_sims: int, chunk_size: int, seed: int
+) -> PathAccumulator:
+    """
+    Simulate fixed-size chunks across the process pool and merge the results.
+
+    Chunk ``i`` always draws from child ``i`` of ``SeedSequence(seed)``, so the
+    merged result depends only on the seed and chunk size, not on how many
+    workers ran it.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    sizes = list(iter_chunks(num_sims, chunk_size))
+    seeds = spawn_seeds(seed, len(sizes))
+
+    # The pilot chunk fixes histogram ranges shared by all other workers
+    accumulator = await loop.run_in_executor(
+        pool, _simulate_pilot, model, sizes[0], seeds[0]
+    )
+
+    remaining = list(zip(sizes[1:], seeds[1:]))
+    groups = [
+        group
+        for group in np.array_split(np.arange(len(remaining)), MONTE_CARLO_WORKERS)
+        if len(group)
+    ]
+    parts = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool,
+                _simulate_chunks,
+                model,
+                [remaining[i] for i in group],
+                accumulator.lo,
+                accumulator.hi,
+            )
+            for group in groups
+        )
+    )
+    for part in parts:
+        accumulator.merge(part)
+    return accumulator
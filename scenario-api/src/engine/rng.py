@@ -0,0 +1,31 @@
+from typing import List
+
+import numpy as np
+
+from ..config.settings import MONTE_CARLO_BIT_GENERATOR
+
+# Bit generators that can back request-local Generators
+BIT_GENERATORS = {
+    "PCG64": np.random.PCG64,
+    "PCG64DXSM": np.random.PCG64DXSM,
+    "PHILOX": np.random.Philox,
+    "SFC64": np.random.SFC64,
+}
+
+
+def make_generator(
+    seed_seq: np.random.SeedSequence, bit_generator: str = MONTE_CARLO_BIT_GENERATOR
+) -> np.random.Generator:
+    """Create an independent Generator; never touches the global NumPy RNG."""
+    try:
+        bit_generator_cls = BIT_GENERATORS[bit_generator.upper()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown bit generator '{bit_generator}'. Valid options: {', '.join(BIT_GENERATORS)}"
+        )
+    return np.random.Generator(bit_generator_cls(seed_seq))
+
+
+def spawn_seeds(seed: int, count: int) -> List[np.random.SeedSequence]:
+    """Independent child seed sequences; child ``i`` is the same for any ``count``."""
+    return np.random.SeedSequence(seed).spawn(count)
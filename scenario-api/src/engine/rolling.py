@@ -0,0 +1,70 @@
+from typing import List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Upper bound on (windows x window points) cells materialized per drawdown block
+MAX_WINDOW_CELLS = 4_000_000
+
+
+def rolling_window_metrics(
+    values: np.ndarray, window: int, step: int = 1
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return, max drawdown and volatility of every rolling window of a value series.
+
+    A window starting at point ``i`` spans points ``i .. i + window``. Returns
+    and volatility come from prefix sums of daily returns; drawdowns take a
+    running max over strided views of the series, in bounded blocks.
+
+    Args:
+        values: Positive portfolio values in date order
+        window: Window length in points (trading days)
+        step: Distance between consecutive window starts
+
+    Returns:
+        (start indices, total returns, max drawdowns in percent, volatilities);
+        volatility is the std of daily returns scaled by sqrt(window), as for
+        the whole-period stress test metric
+    """
+    starts = np.arange(0, len(values) - window, step)
+    ends = starts + window
+
+    total_returns = values[ends] / values[starts] - 1
+
+    # Centering keeps the sum-of-squares variance numerically stable
+    daily = values[1:] / values[:-1] - 1
+    centered = daily - daily.mean()
+    s1 = np.concatenate([[0.0], np.cumsum(centered)])
+    s2 = np.concatenate([[0.0], np.cumsum(centered * centered)])
+    mean = (s1[ends] - s1[starts]) / window
+    variance = np.maximum((s2[ends] - s2[starts]) / window - mean * mean, 0.0)
+    volatilities = np.sqrt(variance * window)
+
+    views = sliding_window_view(values, window + 1)[::step]
+    max_drawdowns = np.empty(len(starts))
+    block = max(1, MAX_WINDOW_CELLS // (window + 1))
+    for first in range(0, len(views), block):
+        chunk = views[first : first + block]
+        peaks = np.maximum.accumulate(chunk, axis=1)
+        max_drawdowns[first : first + block] = ((chunk / peaks).min(axis=1) - 1) * 100
+    return starts, total_returns, max_drawdowns, volatilities
+
+
+def worst_windows(
+    starts: np.ndarray, scores: np.ndarray, window: int, count: int
+) -> List[int]:
+    """
+    Positions of the ``count`` lowest-scoring windows that do not overlap.
+
+    Neighbouring windows share most of their points, so the next worst window
+    overlapping an already chosen one is skipped in favour of a distinct one.
+    """
+    chosen: List[int] = []
+    for position in np.argsort(scores, kind="stable"):
+        start = starts[position]
+        if all(abs(start - starts[c]) >= window for c in chosen):
+            chosen.append(int(position))
+            if len(chosen) == count:
+                break
+    return chosen
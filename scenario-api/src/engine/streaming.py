@@ -0,0 +1,115 @@
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .variance import OutcomeEstimator
+
+# Fine histogram resolution per time point used by the quantile sketch
+SKETCH_BINS = 8192
+
+# Number of final values kept verbatim for display
+SAMPLE_SIZE = 100
+
+
+class PathAccumulator:
+    """
+    Running summary of simulated value paths with constant memory.
+
+    Every time point gets a fixed-bin histogram (plus underflow/overflow bins
+    and exact min/max), which doubles as a streaming quantile sketch. Bin
+    ranges are fixed from a pilot chunk so further chunks, or accumulators
+    built with the same ranges, can be merged by adding counts.
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, base_amount: float):
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.maximum(np.asarray(hi, dtype=float), self.lo + 1e-6)
+        self.width = (self.hi - self.lo) / SKETCH_BINS
+        self.base_amount = base_amount
+        steps = len(self.lo)
+        self.counts = np.zeros((steps, SKETCH_BINS + 2), dtype=np.int64)
+        self.minimum = np.full(steps, np.inf)
+        self.maximum = np.full(steps, -np.inf)
+        self.total = 0
+        self.sample: List[float] = []
+        self.estimator = OutcomeEstimator(base_amount)
+
+    @classmethod
+    def from_pilot(cls, paths: np.ndarray, base_amount: float) -> "PathAccumulator":
+        """Create an accumulator whose bin ranges cover a pilot chunk with margin."""
+        minimum = paths.min(axis=0)
+        maximum = paths.max(axis=0)
+        pad = 0.5 * (maximum - minimum)
+        return cls(np.maximum(minimum - pad, 0.0), maximum + pad, base_amount)
+
+    def update(self, paths: np.ndarray) -> None:
+        """Fold a (chunk x steps) block of paths into the running summary."""
+        row_width = self.counts.shape[1]
+        # Shift by one bin so underflow lands in bin 0 and overflow in the last bin
+        idx = paths - (self.lo - self.width)
+        idx /= self.width
+        np.clip(idx, 0, SKETCH_BINS + 1, out=idx)
+        flat = idx.astype(np.int64)
+        flat += np.arange(len(self.lo)) * row_width
+        self.counts += np.bincount(flat.ravel(), minlength=self.counts.size).reshape(
+            self.counts.shape
+        )
+        np.minimum(self.minimum, paths.min(axis=0), out=self.minimum)
+        np.maximum(self.maximum, paths.max(axis=0), out=self.maximum)
+
+        final_values = paths[:, -1]
+        self.total += len(final_values)
+        if len(self.sample) < SAMPLE_SIZE:
+            self.sample.extend(final_values[: SAMPLE_SIZE - len(self.sample)].tolist())
+
+    def merge(self, other: "PathAccumulator") -> None:
+        """Add another accumulator built with the same bin ranges."""
+        self.counts += other.counts
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        self.total += other.total
+        self.estimator.merge(other.estimator)
+        if len(self.sample) < SAMPLE_SIZE:
+            self.sample.extend(other.sample[: SAMPLE_SIZE - len(self.sample)])
+
+    def _bin_edges(self) -> np.ndarray:
+        """Edges for every bin including underflow/overflow, shape (steps, bins + 3)."""
+        inner = self.lo[:, None] + self.width[:, None] * np.arange(SKETCH_BINS + 1)
+        lower = np.minimum(self.minimum, self.lo)[:, None]
+        upper = np.maximum(self.maximum, self.hi)[:, None]
+        return np.hstack([lower, inner, upper])
+
+    def quantiles(self, percentiles: Sequence[float]) -> np.ndarray:
+        """Approximate percentiles for every time point, shape (len(percentiles), steps)."""
+        edges = self._bin_edges()
+        cumulative = np.cumsum(self.counts, axis=1)
+        rows = np.arange(len(self.lo))
+        out = np.empty((len(percentiles), len(self.lo)))
+        for i, pct in enumerate(percentiles):
+            target = pct / 100.0 * self.total
+            # First bin whose cumulative count reaches the target rank
+            b = np.count_nonzero(cumulative < target, axis=1)
+            b = np.minimum(b, self.counts.shape[1] - 1)
+            before = np.where(b > 0, cumulative[rows, b - 1], 0)
+            in_bin = np.maximum(self.counts[rows, b], 1)
+            frac = np.clip((target - before) / in_bin, 0.0, 1.0)
+            left = edges[rows, b]
+            out[i] = left + frac * (edges[rows, b + 1] - left)
+        return np.clip(out, self.minimum, self.maximum)
+
+    def final_histogram(self, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Equal-width histogram of final values over their observed range."""
+        edges = self._bin_edges()[-1]
+        centers = (edges[:-1] + edges[1:]) / 2
+        lower, upper = self.minimum[-1], self.maximum[-1]
+        coarse_edges = np.linspace(lower, upper, bins + 1)
+        bucket = np.searchsorted(coarse_edges, centers, side="right") - 1
+        np.clip(bucket, 0, bins - 1, out=bucket)
+        hist = np.bincount(bucket, weights=self.counts[-1], minlength=bins)
+        return hist, coarse_edges
+
+
+def iter_chunks(total: int, chunk_size: int) -> Iterator[int]:
+    """Yield chunk sizes that add up to ``total``."""
+    for start in range(0, total, chunk_size):
+        yield min(chunk_size, total - start)
@@ -0,0 +1,226 @@
+import warnings
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+# Independently scrambled Sobol blocks per simulate call; their spread gives
+# the randomized-QMC standard error
+SOBOL_REPLICATES = 8
+
+# Final-value percentiles reported as worst case, median and best case
+OUTCOME_PERCENTILES = (5, 50, 95)
+
+# Independent batches per simulate call whose percentile spread gives the
+# percentile standard errors; batches smaller than the minimum are not formed
+PERCENTILE_REPLICATES = 20
+MIN_REPLICATE_SIZE = 100
+
+
+def fill_standard_normals(
+    rng: np.random.Generator, out: np.ndarray, method: str = "none"
+) -> None:
+    """
+    Fill a (sims x dims) buffer with standard normals for a reduction method.
+
+    "antithetic" mirrors the first half of the rows into the second half,
+    "sobol" maps independently scrambled Sobol blocks through the inverse
+    normal CDF, anything else draws plain pseudo-random normals. ``out``
+    may be a strided view such as ``paths[:, 1:]``.
+    """
+    if not out.flags.c_contiguous:
+        # Generator.standard_normal(out=...) only fills C-contiguous arrays
+        scratch = np.empty(out.shape)
+        fill_standard_normals(rng, scratch, method)
+        out[...] = scratch
+        return
+    num_sims, dims = out.shape
+    if method == "antithetic":
+        half = num_sims // 2
+        rng.standard_normal(out=out[:half])
+        np.negative(out[:half], out=out[half : 2 * half])
+        if num_sims % 2:
+            out[-1] = rng.standard_normal(dims)
+    elif method == "sobol":
+        for block in sobol_blocks(num_sims):
+            engine = qmc.Sobol(d=dims, scramble=True, seed=rng)
+            with warnings.catch_warnings():
+                # Balance is best at powers of two but any block size is valid
+                warnings.simplefilter("ignore", UserWarning)
+                uniforms = engine.random(block.stop - block.start)
+            np.clip(uniforms, 1e-12, 1 - 1e-12, out=uniforms)
+            out[block] = ndtri(uniforms)
+    else:
+        rng.standard_normal(out=out)
+
+
+def sobol_blocks(num_sims: int):
+    """Row slices of the independently scrambled Sobol replicates."""
+    bounds = np.linspace(0, num_sims, min(SOBOL_REPLICATES, num_sims) + 1)
+    bounds = bounds.astype(int)
+    return [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def estimator_units(final_values: np.ndarray, method: str = "none") -> np.ndarray:
+    """
+    Collapse final values into independent units for the standard error.
+
+    Antithetic pairs and Sobol replicates are correlated within themselves,
+    so their means are the independent observations.
+    """
+    if method == "antithetic":
+        half = len(final_values) // 2
+        pairs = (final_values[:half] + final_values[half : 2 * half]) / 2
+        return np.concatenate([pairs, final_values[2 * half :]])
+    if method == "sobol":
+        return np.array(
+            [final_values[b].mean() for b in sobol_blocks(len(final_values))]
+        )
+    return final_values
+
+
+def replicate_rows(num_sims: int, method: str = "none") -> List[np.ndarray]:
+    """
+    Row indices of independent batches of one simulate call.
+
+    Sobol batches are its scrambled replicates and antithetic batches hold
+    both rows of each of their pairs, so batches never share randomness.
+    Returns no batches when the call is too small to split.
+    """
+    count = min(PERCENTILE_REPLICATES, num_sims // MIN_REPLICATE_SIZE)
+    if count < 2:
+        return []
+    if method == "sobol":
+        return [np.arange(b.start, b.stop) for b in sobol_blocks(num_sims)]
+    if method == "antithetic":
+        half = num_sims // 2
+        rows = [
+            np.concatenate([pairs, pairs + half])
+            for pairs in np.array_split(np.arange(half), count)
+        ]
+        if num_sims % 2:
+            rows[-1] = np.append(rows[-1], num_sims - 1)
+        return rows
+    return np.array_split(np.arange(num_sims), count)
+
+
+class MeanEstimator:
+    """
+    Mergeable estimate of a mean with its standard error.
+
+    Keeps running means and co-moments (Chan et al. parallel update) of the
+    units and, for control variates, of a zero-mean control. The control
+    coefficient is fitted from the pooled moments at the end.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_y = 0.0
+        self.mean_c = 0.0
+        self.m_yy = 0.0
+        self.m_cc = 0.0
+        self.m_yc = 0.0
+
+    def update(self, units: np.ndarray, control: Optional[np.ndarray] = None) -> None:
+        """Fold a batch of independent units (and their centered controls) in."""
+        if len(units) == 0:
+            return
+        other = MeanEstimator()
+        other.count = len(units)
+        other.mean_y = float(units.mean())
+        dy = units - other.mean_y
+        other.m_yy = float(dy @ dy)
+        if control is not None:
+            other.mean_c = float(control.mean())
+            dc = control - other.mean_c
+            other.m_cc = float(dc @ dc)
+            other.m_yc = float(dy @ dc)
+        self.merge(other)
+
+    def merge(self, other: "MeanEstimator") -> None:
+        """Combine with another estimator's moments."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        dy = other.mean_y - self.mean_y
+        dc = other.mean_c - self.mean_c
+        factor = self.count * other.count / total
+        self.m_yy += other.m_yy + dy * dy * factor
+        self.m_cc += other.m_cc + dc * dc * factor
+        self.m_yc += other.m_yc + dy * dc * factor
+        self.mean_y += dy * other.count / total
+        self.mean_c += dc * other.count / total
+        self.count = total
+
+    def estimate(self) -> Tuple[float, float]:
+        """(mean, standard error), control-variate adjusted when a control was fed."""
+        if self.count < 2:
+            return self.mean_y, 0.0
+        mean, residual = self.mean_y, self.m_yy
+        if self.m_cc > 0:
+            beta = self.m_yc / self.m_cc
+            mean -= beta * self.mean_c
+            residual = max(self.m_yy - beta * self.m_yc, 0.0)
+        variance = residual / (self.count - 1)
+        return mean, float(np.sqrt(variance / self.count))
+
+
+class OutcomeEstimator:
+    """
+    Mergeable estimates and standard errors of the reported outcomes.
+
+    The mean final value and the profit and doubling probabilities are means
+    of independent units. Under "control_variate" the probabilities are
+    regressed on the unfloored final return, whose mean is known exactly.
+    Percentile standard errors come from the spread of the percentiles of
+    independent batches (see ``replicate_rows``) scaled to the pooled size.
+    """
+
+    def __init__(self, base_amount: float):
+        self.base_amount = base_amount
+        self.value = MeanEstimator()
+        self.profit = MeanEstimator()
+        self.double = MeanEstimator()
+        self.batch_sizes: List[int] = []
+        self.batch_percentiles: List[np.ndarray] = []
+
+    def update(
+        self,
+        final_values: np.ndarray,
+        method: str = "none",
+        control: Optional[np.ndarray] = None,
+    ) -> None:
+        """Fold in the final values (and centered controls) of one simulate call."""
+        if control is not None:
+            control = estimator_units(control, method)
+        profit = (final_values > self.base_amount).astype(float)
+        double = (final_values >= self.base_amount * 2).astype(float)
+        self.value.update(estimator_units(final_values, method))
+        self.profit.update(estimator_units(profit, method), control)
+        self.double.update(estimator_units(double, method), control)
+        for rows in replicate_rows(len(final_values), method):
+            self.batch_sizes.append(len(rows))
+            self.batch_percentiles.append(
+                np.percentile(final_values[rows], OUTCOME_PERCENTILES)
+            )
+
+    def merge(self, other: "OutcomeEstimator") -> None:
+        """Combine with the estimates of another set of simulate calls."""
+        self.value.merge(other.value)
+        self.profit.merge(other.profit)
+        self.double.merge(other.double)
+        self.batch_sizes.extend(other.batch_sizes)
+        self.batch_percentiles.extend(other.batch_percentiles)
+
+    def percentile_errors(self) -> Optional[np.ndarray]:
+        """Standard errors of the pooled OUTCOME_PERCENTILES, None without batches."""
+        if len(self.batch_sizes) < 2:
+            return None
+        sizes = np.array(self.batch_sizes, dtype=float)
+        values = np.array(self.batch_percentiles)
+        total = sizes.sum()
+        center = sizes @ values / total
+        # A batch percentile's variance shrinks as 1 / size, so weight by size
+        spread = sizes @ (values - center) ** 2 / (len(sizes) - 1)
+        return np.sqrt(spread / total)
@@ -1,14 +1,48 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from .config.settings import CORS_ORIGINS, HOST, PORT
+from .config.settings import (
+    CORS_ORIGINS,
+    HOST,
+    LOG_LEVEL,
+    PORT,
+    SCENARIO_PRELOAD_SYMBOLS,
+)
 from .controllers.scenario_controller import router as scenario_router
 from .middleware.error_handler import error_handler
+from .engine.parallel import shutdown_process_pool
+from .services.stress_test_service import stress_test_service
+from .utils.http import hub_session
+from .utils.metrics import metrics
+
+logging.basicConfig(
+    level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled hub connections live for the whole process
+    await hub_session.start()
+    # Warm crisis scenario slices in the background; requests fetch on a miss
+    preload = asyncio.create_task(
+        stress_test_service.preload_scenarios(SCENARIO_PRELOAD_SYMBOLS)
+    )
+    yield
+    preload.cancel()
+    await hub_session.close()
+    shutdown_process_pool()
+
 
 app = FastAPI(
     title="Scenario API",
     version="1.0.0",
     description="Portfolio scenario analysis and Monte Carlo simulation API",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -28,4 +62,12 @@ app.include_router(scenario_router, prefix="/api/v1")
 @app.get("/")
 async def root():
     return {"success": True, "data": {"message": "Scenario API is running"}}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Stage latency histograms and cache counters for Prometheus scraping"""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 # Test comment
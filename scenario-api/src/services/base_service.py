@@ -1,11 +1,35 @@
-from ..config.settings import HUB_URL, API_PREFIX
+from ..config.settings import HUB_URL, API_PREFIX, MAX_BATCH_SIZE
+from ..utils.errors import BadRequest
+from ..utils.http import hub_session
+from ..utils.metrics import hub_request_seconds, metrics, symbol_fetch_seconds
+from ..utils.singleflight import SingleFlight
+from ..utils.wire import PriceHistory, decode_histories
 import urllib.parse
 import asyncio
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Hub history requests in flight, shared by concurrent callers of every service
+history_flight = SingleFlight()
+
+
+def _coalescing_metrics() -> List[str]:
+    stats = history_flight.stats()
+    return [
+        "# HELP scenario_history_fetch_calls_total Symbol history lookups",
+        "# TYPE scenario_history_fetch_calls_total counter",
+        f"scenario_history_fetch_calls_total {stats['calls']}",
+        "# HELP scenario_history_fetch_shared_total Lookups served by a fetch already in flight",
+        "# TYPE scenario_history_fetch_shared_total counter",
+        f"scenario_history_fetch_shared_total {stats['shared']}",
+    ]
+
+
+metrics.register_collector(_coalescing_metrics)
+
 
 class BaseService:
     """Base service providing common functionality for scenario analysis."""
@@ -38,73 +62,77 @@ class BaseService:
         return "MAX"
 
     async def _fetch_histories(
-        self, symbols: List[str], timeframe: str
-    ) -> Dict[str, List[Dict[str, float]]]:
-        """Fetch historical data for symbols from the hub stock endpoint."""
-        print(
-            f"🔥 _FETCH_HISTORIES: Called with symbols={symbols}, timeframe={timeframe}"
-        )
-        import aiohttp
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, PriceHistory]:
+        """
+        Fetch historical data for symbols from the hub stock endpoint.
+
+        Args:
+            symbols: Ticker symbols to fetch
+            timeframe: Period bucket, used when no explicit range is given
+            start_date: First date to fetch (YYYY-MM-DD); when set the hub
+                returns only ``start_date .. end_date`` instead of the bucket
+            end_date: Last date to fetch (inclusive), defaults to today
+        """
+        query = {"period": timeframe.upper()}
+        if start_date:
+            query["start"] = start_date
+            if end_date:
+                query["end"] = end_date
+        logger.debug("Fetching %s histories for %s", timeframe, symbols)
+        started = time.perf_counter()
 
-        async def fetch_one(session: aiohttp.ClientSession, symbol: str):
-            url = f"{HUB_URL}{API_PREFIX}/stocks/{urllib.parse.quote(symbol)}/history?period={urllib.parse.quote(timeframe.upper())}"
-            print(f"🔥 FETCH_ONE: Fetching stock data for {symbol} from: {url}")
-            logger.info(f"Fetching stock data for {symbol} from: {url}")
+        async def fetch_batch(batch: List[str]) -> Dict[str, PriceHistory]:
+            params = {"symbols": ",".join(batch), "format": "binary", **query}
+            url = f"{HUB_URL}{API_PREFIX}/stocks/history/batch?{urllib.parse.urlencode(params)}"
+            logger.debug("Fetching stock data for %d symbols from: %s", len(batch), url)
+            request_started = time.perf_counter()
             try:
-                async with session.get(url, timeout=10) as resp:
-                    print(
-                        f"🔥 FETCH_ONE: Got response for {symbol}: status={resp.status}"
-                    )
+                async with hub_session.get(url) as resp:
                     resp.raise_for_status()
-                    data = await resp.json()
-                    print(
-                        f"🔥 FETCH_ONE: JSON response for {symbol}: success={data.get('success')}"
-                    )
-                    print(
-                        f"🔥 FETCH_ONE: Data type for {symbol}: {type(data.get('data'))}"
-                    )
-                    logger.info(
-                        f"Stock API response for {symbol}: success={data.get('success')}, data_type={type(data.get('data'))}"
-                    )
-                    # hub responds { success, data: [ {date, close} ] } - data is directly the array
-                    if not data.get("success"):
-                        print(
-                            f"🔥 FETCH_ONE: Stock API returned success=False for {symbol}"
-                        )
-                        logger.warning(f"Stock API returned success=False for {symbol}")
-                        return symbol, []
-
-                    # The server returns the data array directly, not nested in a data object
-                    arr = data.get("data", [])
-                    print(
-                        f"🔥 FETCH_ONE: Stock data for {symbol}: {len(arr)} price points"
-                    )
-                    logger.info(
-                        f"Stock data for {symbol}: {len(arr)} price points, sample: {arr[:3] if arr else 'None'}"
-                    )
-                    return symbol, arr
+                    # Packed day offsets and closes, decoded straight into arrays
+                    histories = decode_histories(await resp.read())
             except Exception as e:
-                print(f"🔥 FETCH_ONE: Exception for {symbol}: {type(e).__name__}: {e}")
-                logger.error(f"Exception fetching {symbol}: {type(e).__name__}: {e}")
-                return symbol, []
+                hub_request_seconds.observe(
+                    time.perf_counter() - request_started, "error"
+                )
+                logger.error(
+                    "Exception fetching %s: %s: %s", batch, type(e).__name__, e
+                )
+                return {}
+            hub_request_seconds.observe(time.perf_counter() - request_started, "ok")
+            return histories
 
-        history_map: Dict[str, List[Dict[str, float]]] = {}
-        async with aiohttp.ClientSession() as session:
-            tasks = [fetch_one(session, s) for s in symbols]
-            print(f"🔥 GATHER: Starting asyncio.gather for {len(tasks)} tasks")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            print(f"🔥 GATHER: Got {len(results)} results")
+        async def take(batch_task: asyncio.Future, symbol: str):
+            histories = await batch_task
+            history = histories.get(symbol.upper()) or PriceHistory.empty()
+            symbol_fetch_seconds.observe(time.perf_counter() - started)
+            logger.debug("Stock data for %s: %d price points", symbol, len(history))
+            return symbol, history
 
-        for i, res in enumerate(results):
-            print(f"🔥 RESULTS: Processing result {i}: {type(res)}")
+        # Concurrent requests for the same symbol and range await one fetch;
+        # symbols not already in flight go to the hub in MAX_BATCH_SIZE batches
+        query_key = tuple(sorted(query.items()))
+        pending = [s for s in symbols if not history_flight.in_flight((s, query_key))]
+        batch_tasks = {}
+        for i in range(0, len(pending), MAX_BATCH_SIZE):
+            batch = pending[i : i + MAX_BATCH_SIZE]
+            task = asyncio.ensure_future(fetch_batch(batch))
+            batch_tasks.update((s, task) for s in batch)
+        tasks = [
+            history_flight.submit((s, query_key), lambda s=s: take(batch_tasks[s], s))
+            for s in symbols
+        ]
+        history_map: Dict[str, PriceHistory] = {}
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for res in results:
             if isinstance(res, Exception):
-                print(f"🔥 RESULTS: Exception in result {i}: {res}")
+                logger.warning("History fetch failed: %s: %s", type(res).__name__, res)
                 continue
             sym, arr = res
-            print(f"🔥 RESULTS: Adding {sym} with {len(arr)} data points")
             history_map[sym] = arr
-
-        print(
-            f"🔥 FINAL: History map has {len(history_map)} entries: {list(history_map.keys())}"
-        )
         return history_map
@@ -1,16 +1,53 @@
 from ..dto.scenario import (
+    MonteCarloBatchParams,
     MonteCarloParams,
+    MonteCarloResponse,
     MonteCarloResult,
     Portfolio,
     ChartDataPoint,
     MonteCarloProjections,
     MonteCarloOutcomes,
+    OutcomeStandardErrors,
     DistributionData,
 )
 from ..utils.errors import BadRequest
+from ..utils.cache import TTLCache
+from ..utils.metrics import metrics, stage_seconds
+from ..utils.wire import PriceHistory
 from .base_service import BaseService
-from ..config.settings import BASE_PORTFOLIO_AMOUNT
-from typing import Dict, List
+from .symbol_stats import SymbolStats, symbol_stats_store
+from ..config.settings import (
+    BASE_PORTFOLIO_AMOUNT,
+    CACHE_DURATION,
+    RESULT_CACHE_SIZE,
+    MONTE_CARLO_BATCH_MAX_CELLS,
+    MONTE_CARLO_BATCH_MAX_PORTFOLIOS,
+    MONTE_CARLO_CHUNK_SIZE,
+    MONTE_CARLO_MAX_SIMULATIONS,
+    MONTE_CARLO_SEED,
+)
+from ..engine.batch import SharedNormalPaths
+from ..engine.bootstrap import BlockBootstrapPathModel
+from ..engine.downsample import downsample_indices
+from ..engine.covariance import (
+    aligned_return_matrix,
+    annualized_covariance,
+    cholesky_factor,
+    portfolio_volatility,
+)
+from ..engine.monte_carlo import (
+    PROJECTION_PERCENTILES,
+    NormalPathModel,
+    projection_time_points,
+)
+from ..engine.parallel import run_exact, run_streaming
+from ..engine.streaming import PathAccumulator
+from ..engine.variance import OUTCOME_PERCENTILES, OutcomeEstimator
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,243 +56,571 @@ logger = logging.getLogger(__name__)
 class MonteCarloService(BaseService):
     """Service for running Monte Carlo simulations on portfolios."""
 
+    def __init__(self):
+        self.result_cache = TTLCache(RESULT_CACHE_SIZE, CACHE_DURATION)
+        # Latest price date per symbol, used to key results without refetching
+        self.price_dates = TTLCache(RESULT_CACHE_SIZE * 10, CACHE_DURATION)
+        metrics.register_cache("monte_carlo_results", self.result_cache)
+
     async def run_monte_carlo(self, params: MonteCarloParams) -> MonteCarloResult:
         """Run Monte Carlo simulation on portfolio"""
-        print(
-            f"🔥 SERVICE DEBUG: Running Monte Carlo for portfolio {params.portfolio_id}, {params.simulations} sims, {params.time_horizon}Y"
-        )
-        print(f"🔥 SERVICE DEBUG: Full params object: {params}")
-        print(f"🔥 SERVICE DEBUG: Params model dump: {params.model_dump()}")
-
         logger.info(
-            f"Running Monte Carlo for portfolio {params.portfolio_id}, {params.simulations} sims, {params.time_horizon}Y"
+            "Running Monte Carlo for portfolio %s, %d sims, %dY",
+            params.portfolio_id,
+            params.simulations,
+            params.time_horizon,
         )
-        logger.info(f"Full params object: {params}")
-        logger.info(f"Params model dump: {params.model_dump()}")
 
         # Validate inputs
+        if params.time_horizon < 1:
+            raise BadRequest("time_horizon must be at least 1 year")
+        if params.simulations < 1:
+            raise BadRequest("simulations must be at least 1")
+        if params.seed is not None and params.seed < 0:
+            raise BadRequest("seed must be a non-negative integer")
+        if params.simulations > MONTE_CARLO_MAX_SIMULATIONS:
+            raise BadRequest(
+                f"simulations must be at most {MONTE_CARLO_MAX_SIMULATIONS}"
+            )
+        if params.mode == "bootstrap" and params.variance_reduction != "none":
+            raise BadRequest("variance_reduction is not supported in bootstrap mode")
+
         holdings = params.model_dump().get("holdings") or []
-        print(f"🔥 HOLDINGS DEBUG: Holdings received: {len(holdings)} assets")
-        print(f"🔥 HOLDINGS DEBUG: Raw holdings data: {holdings}")
-        logger.info(f"Holdings received: {len(holdings)} assets")
-        logger.info(f"Raw holdings data: {holdings}")
+        logger.debug("Holdings received: %s", holdings)
         if not holdings:
             raise BadRequest("Holdings are required for Monte Carlo simulation")
 
         # Fetch 5Y historical data for return/volatility calculation
         symbols = [h.get("symbol") for h in holdings if h.get("allocation", 0) > 0]
-        print(f"🔥 SYMBOLS DEBUG: Extracted symbols from holdings: {symbols}")
-        print(
-            f"🔥 SYMBOLS DEBUG: Holdings with allocations > 0: {[(h.get('symbol'), h.get('allocation')) for h in holdings if h.get('allocation', 0) > 0]}"
-        )
-
-        logger.info(f"Extracted symbols from holdings: {symbols}")
-        logger.info(
-            f"Holdings with allocations > 0: {[(h.get('symbol'), h.get('allocation')) for h in holdings if h.get('allocation', 0) > 0]}"
-        )
-        logger.info(f"About to fetch market data for symbols: {symbols}")
-
         if not symbols:
-            print(f"🔥 ERROR: No symbols to fetch! Holdings processing failed.")
             logger.error("No symbols to fetch! Holdings processing failed.")
             return
 
-        print(f"🔥 FETCH DEBUG: Starting _fetch_histories call for symbols: {symbols}")
-        history_map = await self._fetch_histories(symbols, "5Y")  # Use 5Y instead of 2Y
-        print(
-            f"🔥 FETCH DEBUG: _fetch_histories completed, got {len(history_map)} results"
-        )
-        print(f"🔥 FETCH DEBUG: History map keys: {list(history_map.keys())}")
+        # Serve repeat views from the result cache while price data is unchanged
+        cache_key = self._result_cache_key(params, holdings)
+        known_as_of = self._known_price_date(symbols)
+        if known_as_of:
+            cached = self.result_cache.get((cache_key, known_as_of))
+            if cached is not None:
+                return self._for_request(cached, params)
 
-        logger.info(f"Market data fetched for {len(history_map)} symbols")
-        logger.info(f"History map keys: {list(history_map.keys())}")
+        with stage_seconds.time("monte_carlo", "fetch"):
+            history_map = await self._fetch_histories(symbols, "5Y")
+        logger.debug("Market data fetched for %d symbols", len(history_map))
+
+        as_of = self._record_price_dates(history_map)
+        if as_of != known_as_of:
+            cached = self.result_cache.get((cache_key, as_of))
+            if cached is not None:
+                return self._for_request(cached, params)
 
         # Calculate returns and covariance matrix
-        returns_data = self._calculate_asset_returns(history_map)
-        logger.info(f"Calculated returns for {len(returns_data)} assets")
+        with stage_seconds.time("monte_carlo", "returns"):
+            returns_data = self._calculate_asset_returns(history_map)
 
-        # Run Monte Carlo simulation
+        # Run Monte Carlo simulation over the projection time grid
         base_amount = BASE_PORTFOLIO_AMOUNT
-        final_values = self._run_simulation(
-            holdings, returns_data, params.simulations, params.time_horizon, base_amount
+        time_points = projection_time_points(params.time_horizon)
+        model = self._build_path_model(
+            holdings,
+            returns_data,
+            params.mode,
+            time_points,
+            base_amount,
+            params.variance_reduction,
         )
-        import numpy as np
+        seed = MONTE_CARLO_SEED if params.seed is None else params.seed
+
+        accumulator = None
+        with stage_seconds.time("monte_carlo", "simulation"):
+            if model is None:
+                # Flat outcome; statistics of a constant sample don't depend on its size
+                final_values = np.full(
+                    min(params.simulations, MONTE_CARLO_CHUNK_SIZE), base_amount
+                )
+                bands = None
+                estimator = OutcomeEstimator(base_amount)
+                estimator.update(final_values)
+            elif params.simulations > MONTE_CARLO_CHUNK_SIZE:
+                # Runs over one chunk are sharded across the worker pool
+                accumulator = await self._run_streaming_simulation(
+                    model, params.simulations, seed
+                )
+                bands = accumulator.quantiles(PROJECTION_PERCENTILES)
+            else:
+                bands, final_values, estimator = await self._run_simulation(
+                    model, params.simulations, seed
+                )
 
-        logger.info(
-            f"Monte Carlo simulation complete: {len(final_values)} scenarios, median=${np.median(final_values):.2f}"
-        )
+        with stage_seconds.time("monte_carlo", "distribution"):
+            if accumulator is not None:
+                outcomes = self._accumulated_outcomes(accumulator)
+                distribution = self._accumulated_distribution(accumulator)
+            else:
+                outcomes = self._calculate_outcomes(final_values, estimator)
+                distribution = self._generate_distribution(final_values)
 
-        # Generate time series projections
-        projections = self._generate_projections(
-            holdings, returns_data, params.time_horizon, params.simulations, base_amount
+        logger.info(
+            "Monte Carlo simulation complete: %d scenarios, median=$%.2f",
+            params.simulations,
+            outcomes.median,
         )
 
-        # Calculate outcomes
-        outcomes = self._calculate_outcomes(final_values, base_amount)
+        # Generate time series projections from the same paths
+        with stage_seconds.time("monte_carlo", "projections"):
+            projections = self._generate_projections(bands, time_points, base_amount)
 
-        # Generate distribution data
-        distribution = self._generate_distribution(final_values)
-
-        return MonteCarloResult(
+        result = MonteCarloResult(
             portfolio=Portfolio(id=params.portfolio_id, name="Portfolio"),
             params=params,
             projections=projections,
             outcomes=outcomes,
             distribution_data=distribution,
         )
+        # Cached at full resolution; each request downsamples its own copy
+        self.result_cache.set((cache_key, as_of), result)
+        return self._for_request(result, params)
+
+    async def run_monte_carlo_batch(
+        self, params: MonteCarloBatchParams
+    ) -> AsyncIterator[MonteCarloResponse]:
+        """
+        Run Monte Carlo for many portfolios over one shared set of asset shocks.
+
+        Histories for the union of symbols are fetched once and standard
+        normal shocks are drawn once. Each portfolio's drift and volatility
+        come from the covariance of its own symbols, exactly as for a single
+        correlated run, so with the same seed a batched portfolio reproduces
+        that run; a group of portfolios is then one broadcast over the shared
+        shocks. Validation and data loading happen before this returns, so
+        errors surface before results start streaming.
+
+        Returns:
+            Async iterator yielding one response per portfolio, in request order
+        """
+        if params.time_horizon < 1:
+            raise BadRequest("time_horizon must be at least 1 year")
+        if params.simulations < 1:
+            raise BadRequest("simulations must be at least 1")
+        if params.seed is not None and params.seed < 0:
+            raise BadRequest("seed must be a non-negative integer")
+        if not params.portfolios:
+            raise BadRequest("portfolios must not be empty")
+        if len(params.portfolios) > MONTE_CARLO_BATCH_MAX_PORTFOLIOS:
+            raise BadRequest(
+                f"portfolios must contain at most {MONTE_CARLO_BATCH_MAX_PORTFOLIOS} entries"
+            )
+        for portfolio in params.portfolios:
+            if not portfolio.holdings:
+                raise BadRequest(
+                    f"Holdings are required for portfolio {portfolio.portfolio_id}"
+                )
 
-    def _calculate_asset_returns(
-        self, history_map: Dict[str, List[Dict[str, float]]]
-    ) -> Dict[str, Dict]:
-        """Calculate mean returns and volatility for each asset"""
-        import numpy as np
-
+        symbols = sorted(
+            {
+                h.get("symbol")
+                for portfolio in params.portfolios
+                for h in portfolio.holdings
+                if h.get("symbol") and h.get("allocation", 0) > 0
+            }
+        )
         logger.info(
-            f"Processing asset returns for {len(history_map)} symbols: {list(history_map.keys())}"
+            "Running batch Monte Carlo for %d portfolios over %d symbols",
+            len(params.portfolios),
+            len(symbols),
         )
-        returns_data = {}
-        for symbol, prices in history_map.items():
-            logger.info(f"Processing {symbol}: {len(prices)} price points")
-            if len(prices) < 2:
-                logger.warning(
-                    f"Skipping {symbol}: insufficient price data ({len(prices)} points)"
+
+        history_map = await self._fetch_histories(symbols, "5Y") if symbols else {}
+        self._record_price_dates(history_map)
+        returns_data = self._calculate_asset_returns(history_map)
+
+        weights = [
+            self._portfolio_weights(portfolio.holdings, returns_data)
+            for portfolio in params.portfolios
+        ]
+        # Portfolios with the same symbols share one covariance factor
+        factors: Dict[Tuple[str, ...], np.ndarray] = {}
+        moments = np.zeros((2, len(weights)))
+        for j, w in enumerate(weights):
+            if w:
+                moments[:, j] = self._portfolio_moments(
+                    w, returns_data, "correlated", factors
                 )
-                continue
 
-            # Calculate daily returns
-            logger.info(
-                f"Sample prices for {symbol}: {prices[:3] if prices else 'None'}"
+        base_amount = BASE_PORTFOLIO_AMOUNT
+        time_points = projection_time_points(params.time_horizon)
+        cells = params.simulations * (len(time_points) - 1)
+        if cells > MONTE_CARLO_BATCH_MAX_CELLS:
+            raise BadRequest(
+                f"simulations x steps must be at most {MONTE_CARLO_BATCH_MAX_CELLS} for a batch run"
             )
-            price_values = [p.get("close", 0) for p in prices if p.get("close")]
-            logger.info(
-                f"Extracted {len(price_values)} valid close prices for {symbol}"
+
+        shared = None
+        if any(weights):
+            seed = MONTE_CARLO_SEED if params.seed is None else params.seed
+            loop = asyncio.get_running_loop()
+            shared = await loop.run_in_executor(
+                None,
+                SharedNormalPaths,
+                time_points,
+                base_amount,
+                params.simulations,
+                seed,
+                MONTE_CARLO_CHUNK_SIZE,
             )
-            if len(price_values) < 2:
-                logger.warning(
-                    f"Skipping {symbol}: insufficient valid close prices ({len(price_values)} valid)"
-                )
-                continue
 
-            returns = np.diff(price_values) / price_values[:-1]
-            mean_return = float(np.mean(returns)) * 252
-            volatility = float(np.std(returns)) * np.sqrt(252)
+        return self._stream_batch_results(
+            params, shared, weights, moments, time_points, base_amount
+        )
 
-            logger.info(
-                f"Calculated returns for {symbol}: mean_return={mean_return:.4f}, volatility={volatility:.4f}"
-            )
+    async def _stream_batch_results(
+        self,
+        params: MonteCarloBatchParams,
+        shared: Optional[SharedNormalPaths],
+        weights: List[Dict[str, float]],
+        moments: np.ndarray,
+        time_points: np.ndarray,
+        base_amount: float,
+    ) -> AsyncIterator[MonteCarloResponse]:
+        """Simulate portfolio groups off the event loop and yield each result"""
+        loop = asyncio.get_running_loop()
+        total = len(params.portfolios)
+        group_size = shared.group_size() if shared is not None else total
+
+        for start in range(0, total, group_size):
+            stop = min(start + group_size, total)
+            if shared is not None:
+                bands, final_values = await loop.run_in_executor(
+                    None,
+                    shared.summarize,
+                    moments[0, start:stop],
+                    moments[1, start:stop],
+                )
 
-            returns_data[symbol] = {
-                "mean_return": mean_return,  # Annualized
-                "volatility": volatility,  # Annualized
-                "returns": returns.tolist(),
+            for offset, index in enumerate(range(start, stop)):
+                portfolio = params.portfolios[index]
+                if shared is None or not weights[index]:
+                    # Flat outcome, as for a single portfolio without returns data
+                    portfolio_bands = None
+                    portfolio_finals = np.full(
+                        min(params.simulations, MONTE_CARLO_CHUNK_SIZE), base_amount
+                    )
+                else:
+                    portfolio_bands = bands[:, offset, :]
+                    portfolio_finals = final_values[offset]
+
+                estimator = OutcomeEstimator(base_amount)
+                estimator.update(portfolio_finals)
+                result = MonteCarloResult(
+                    portfolio=Portfolio(id=portfolio.portfolio_id, name="Portfolio"),
+                    params=MonteCarloParams(
+                        portfolio_id=portfolio.portfolio_id,
+                        time_horizon=params.time_horizon,
+                        simulations=params.simulations,
+                        confidence_interval=params.confidence_interval,
+                        holdings=portfolio.holdings,
+                        mode="correlated",
+                        seed=params.seed,
+                    ),
+                    projections=self._downsample_projections(
+                        self._generate_projections(
+                            portfolio_bands, time_points, base_amount
+                        ),
+                        params.max_points,
+                    ),
+                    outcomes=self._calculate_outcomes(portfolio_finals, estimator),
+                    distribution_data=self._generate_distribution(portfolio_finals),
+                )
+                yield MonteCarloResponse(success=True, data=result)
+
+    def _result_cache_key(self, params: MonteCarloParams, holdings: List[Dict]) -> str:
+        """Canonical hash of everything that determines a simulation result"""
+        payload = {
+            "holdings": sorted(
+                [str(h.get("symbol", "")).upper(), float(h.get("allocation", 0))]
+                for h in holdings
+            ),
+            "time_horizon": params.time_horizon,
+            "simulations": params.simulations,
+            "seed": MONTE_CARLO_SEED if params.seed is None else params.seed,
+            "mode": params.mode,
+            "variance_reduction": params.variance_reduction,
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _known_price_date(self, symbols: List[str]) -> Optional[str]:
+        """Latest price date seen for all symbols, if every one was fetched recently"""
+        dates = [self.price_dates.get(s) for s in symbols]
+        if not dates or any(d is None for d in dates):
+            return None
+        return max(dates)
+
+    def _record_price_dates(
+        self, history_map: Dict[str, PriceHistory]
+    ) -> Optional[str]:
+        """Remember each symbol's latest price date and return the overall latest"""
+        latest = None
+        for symbol, history in history_map.items():
+            last_date = history.last_date
+            if not last_date:
+                continue
+            self.price_dates.set(symbol, last_date)
+            latest = last_date if latest is None else max(latest, last_date)
+        return latest
+
+    def _for_request(
+        self, cached: MonteCarloResult, params: MonteCarloParams
+    ) -> MonteCarloResult:
+        """Re-label a cached result with the portfolio and params of this request"""
+        return cached.model_copy(
+            update={
+                "portfolio": Portfolio(id=params.portfolio_id, name="Portfolio"),
+                "params": params,
+                "projections": self._downsample_projections(
+                    cached.projections, params.max_points
+                ),
             }
+        )
 
-        logger.info(
-            f"Returns calculation complete: {len(returns_data)} symbols processed successfully"
+    def _downsample_projections(
+        self, projections: MonteCarloProjections, max_points: Optional[int]
+    ) -> MonteCarloProjections:
+        """
+        Thin every percentile band to the same LTTB-selected dates.
+
+        Points are chosen on the median band, keeping the lowest point of the
+        5th and the highest of the 95th percentile so the fan keeps its width.
+        """
+        if max_points is None or len(projections.percentile50) <= max_points:
+            return projections
+        p5 = np.array([p.value for p in projections.percentile5])
+        p95 = np.array([p.value for p in projections.percentile95])
+        median = np.array([p.value for p in projections.percentile50])
+        index = downsample_indices(
+            np.arange(len(median)),
+            median,
+            max_points,
+            [int(np.argmin(p5)), int(np.argmax(p95))],
+        ).tolist()
+        return MonteCarloProjections(
+            **{
+                band: [points[i] for i in index]
+                for band, points in projections.model_dump(mode="python").items()
+            }
         )
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit/miss counters for the result cache"""
+        return {
+            "monte_carlo_results": self.result_cache.stats(),
+            "symbol_stats": symbol_stats_store.cache.stats(),
+        }
+
+    def _calculate_asset_returns(
+        self, history_map: Dict[str, PriceHistory], timeframe: str = "5Y"
+    ) -> Dict[str, SymbolStats]:
+        """Look up mean returns and volatility for each asset in the stats store"""
+        logger.debug("Processing asset returns for %s", list(history_map))
+        returns_data = {}
+        for symbol, stats in symbol_stats_store.get_many(
+            history_map, timeframe
+        ).items():
+            if len(stats.closes) < 2:
+                logger.warning(
+                    "Skipping %s: insufficient valid close prices (%d valid)",
+                    symbol,
+                    len(stats.closes),
+                )
+                continue
+
+            logger.debug(
+                "Calculated returns for %s: mean_return=%.4f, volatility=%.4f",
+                symbol,
+                stats.mean_return,
+                stats.volatility,
+            )
+            returns_data[symbol] = stats
+
+        logger.debug("Returns calculated for %d symbols", len(returns_data))
         return returns_data
 
-    def _run_simulation(
+    def _build_path_model(
         self,
         holdings: List[Dict],
-        returns_data: Dict,
-        num_sims: int,
-        time_horizon: int,
+        returns_data: Dict[str, SymbolStats],
+        mode: str,
+        time_points: np.ndarray,
         base_amount: float,
-    ) -> List[float]:
-        """Run Monte Carlo simulation and return final portfolio values"""
-        import numpy as np
-
-        logger.info(
-            f"Running simulation with {len(holdings)} holdings and {len(returns_data)} return datasets"
+        variance_reduction: str = "none",
+    ):
+        """Path model for the requested simulation mode, or None without data"""
+        weights = self._portfolio_weights(holdings, returns_data)
+        if not weights:
+            return None
+        if mode == "bootstrap":
+            daily_returns = self._historical_portfolio_returns(weights, returns_data)
+            return BlockBootstrapPathModel(daily_returns, time_points, base_amount)
+        portfolio_return, portfolio_vol = self._portfolio_moments(
+            weights, returns_data, mode
         )
-        logger.info(
-            f"Holdings details: {[(h.get('symbol'), h.get('allocation')) for h in holdings]}"
+        return NormalPathModel(
+            portfolio_return,
+            portfolio_vol,
+            time_points,
+            base_amount,
+            variance_reduction,
+        )
+
+    def _portfolio_weights(
+        self, holdings: List[Dict], returns_data: Dict[str, SymbolStats]
+    ) -> Dict[str, float]:
+        """Portfolio weights for holdings that have returns data"""
+        logger.debug(
+            "Weighting %d holdings over %d return datasets",
+            len(holdings),
+            len(returns_data),
         )
-        logger.info(f"Returns data available for: {list(returns_data.keys())}")
 
         # Portfolio weights
         weights = {}
         total_allocation = sum(h.get("allocation", 0) for h in holdings)
-        logger.info(f"Total allocation: {total_allocation}")
 
         for h in holdings:
             symbol = h.get("symbol")
             allocation = h.get("allocation", 0)
-            logger.info(f"Processing holding: {symbol} with allocation {allocation}")
             if symbol in returns_data:
                 weight = allocation / max(total_allocation, 1)
                 weights[symbol] = weight
-                logger.info(f"Added weight for {symbol}: {weight}")
             else:
-                logger.warning(f"No returns data found for {symbol}")
+                logger.warning("No returns data found for %s", symbol)
 
-        logger.info(f"Final weights: {weights}")
+        logger.debug("Final weights: %s", weights)
 
         if not weights:
             logger.warning(
-                f"No weights calculated - returning flat {base_amount}. Holdings: {[h.get('symbol') for h in holdings]}, Returns data keys: {list(returns_data.keys())}"
+                "No weights calculated - returning flat values. Holdings: %s, returns data: %s",
+                [h.get("symbol") for h in holdings],
+                list(returns_data),
             )
-            return [base_amount] * num_sims
+        return weights
 
-        # Calculate portfolio expected return and volatility
+    def _portfolio_moments(
+        self,
+        weights: Dict[str, float],
+        returns_data: Dict[str, SymbolStats],
+        mode: str = "independent",
+        factors: Optional[Dict[Tuple[str, ...], np.ndarray]] = None,
+    ) -> Tuple[float, float]:
+        """Annualized portfolio return and volatility
+
+        ``factors`` memoizes covariance factors by symbol tuple across calls.
+        """
         symbols = list(weights.keys())
-        mean_returns = np.array([returns_data[s]["mean_return"] for s in symbols])
-        volatilities = np.array([returns_data[s]["volatility"] for s in symbols])
+        mean_returns = np.array([returns_data[s].mean_return for s in symbols])
+        volatilities = np.array([returns_data[s].volatility for s in symbols])
         weight_array = np.array([weights[s] for s in symbols])
 
-        # Portfolio metrics (simplified - no correlation matrix for now)
-        portfolio_return = np.dot(weight_array, mean_returns)
-        portfolio_vol = np.sqrt(np.dot(weight_array**2, volatilities**2))
+        portfolio_return = float(np.dot(weight_array, mean_returns))
+        if mode == "correlated":
+            portfolio_vol = self._correlated_volatility(
+                symbols, returns_data, weight_array, volatilities, factors
+            )
+        else:
+            # Independent assets: ignores cross-asset correlation
+            portfolio_vol = float(np.sqrt(np.dot(weight_array**2, volatilities**2)))
 
-        logger.info(
-            f"Portfolio calc: return={portfolio_return:.4f}, vol={portfolio_vol:.4f}, weights={dict(zip(symbols, weight_array))}"
+        logger.debug(
+            "Portfolio calc: return=%.4f, vol=%.4f", portfolio_return, portfolio_vol
         )
+        return portfolio_return, portfolio_vol
 
-        # Run simulations
-        np.random.seed(42)  # For reproducible results
-        final_values = []
-
-        for _ in range(num_sims):
-            # Generate random return for time horizon
-            random_return = np.random.normal(
-                portfolio_return * time_horizon, portfolio_vol * np.sqrt(time_horizon)
+    def _correlated_volatility(
+        self,
+        symbols: List[str],
+        returns_data: Dict[str, SymbolStats],
+        weights: np.ndarray,
+        volatilities: np.ndarray,
+        factors: Optional[Dict[Tuple[str, ...], np.ndarray]] = None,
+    ) -> float:
+        """Portfolio volatility from the date-aligned covariance matrix"""
+        # Portfolio shocks are w' L z with z ~ N(0, I), whose volatility is |L' w|
+        key = tuple(symbols)
+        chol = factors.get(key) if factors is not None else None
+        if chol is None:
+            chol = self._covariance_factor(symbols, returns_data, volatilities)
+            if factors is not None:
+                factors[key] = chol
+        portfolio_vol = portfolio_volatility(weights, chol)
+        logger.debug("Correlated volatility: %.4f", portfolio_vol)
+        return portfolio_vol
+
+    def _covariance_factor(
+        self,
+        symbols: List[str],
+        returns_data: Dict[str, SymbolStats],
+        volatilities: np.ndarray,
+    ) -> np.ndarray:
+        """Cholesky factor of the annualized date-aligned covariance matrix"""
+        aligned = aligned_return_matrix(
+            [returns_data[s].return_dates for s in symbols],
+            [returns_data[s].returns for s in symbols],
+        )
+        if len(aligned) < 2:
+            logger.warning(
+                "Not enough overlapping dates for a covariance matrix; assuming independent assets"
             )
-            final_value = base_amount * (1 + random_return)
-            final_values.append(max(final_value, 0))  # Prevent negative values
-
-        return final_values
+            cov = np.diag(volatilities**2)
+        else:
+            cov = annualized_covariance(aligned)
+        logger.debug("Covariance matrix from %d aligned days", len(aligned))
+        return cholesky_factor(cov)
+
+    def _historical_portfolio_returns(
+        self, weights: Dict[str, float], returns_data: Dict[str, SymbolStats]
+    ) -> np.ndarray:
+        """Daily portfolio returns over the dates all holdings have in common"""
+        symbols = list(weights.keys())
+        aligned = aligned_return_matrix(
+            [returns_data[s].return_dates for s in symbols],
+            [returns_data[s].returns for s in symbols],
+        )
+        if len(aligned) < 2:
+            raise BadRequest(
+                "Not enough overlapping price history for a bootstrap simulation"
+            )
+        logger.debug("Bootstrap history: %d aligned days", len(aligned))
+        # Resampling whole days of the weighted series keeps cross-asset correlation
+        return aligned @ np.array([weights[s] for s in symbols])
+
+    async def _run_simulation(
+        self, model, num_sims: int, seed: int
+    ) -> Tuple[np.ndarray, np.ndarray, OutcomeEstimator]:
+        """Run Monte Carlo simulation off the event loop, return bands, final values and outcome estimates"""
+        return await run_exact(model, num_sims, seed)
+
+    async def _run_streaming_simulation(
+        self, model, num_sims: int, seed: int
+    ) -> PathAccumulator:
+        """Run Monte Carlo simulation in chunks across worker processes"""
+        return await run_streaming(model, num_sims, MONTE_CARLO_CHUNK_SIZE, seed)
 
     def _generate_projections(
         self,
-        holdings: List[Dict],
-        returns_data: Dict,
-        time_horizon: int,
-        num_sims: int,
+        bands: Optional[np.ndarray],
+        time_points: np.ndarray,
         base_amount: float,
     ) -> MonteCarloProjections:
         """Generate percentile projections over time"""
-        import numpy as np
         from datetime import datetime, timedelta
 
-        # Simplified: generate monthly projections
-        months = min(time_horizon * 12, 60)  # Cap at 5 years of monthly data
-        time_points = np.linspace(0, time_horizon, months)
-
-        # Portfolio metrics (reuse calculation)
-        weights = {}
-        total_allocation = sum(h.get("allocation", 0) for h in holdings)
-        for h in holdings:
-            symbol = h.get("symbol")
-            if symbol in returns_data:
-                weights[symbol] = h.get("allocation", 0) / max(total_allocation, 1)
+        dates = [
+            (datetime.now() + timedelta(days=30 * i)).strftime("%Y-%m-%d")
+            for i in range(len(time_points))
+        ]
 
-        if not weights:
+        if bands is None:
             # Fallback to flat growth
-            dates = [
-                (datetime.now() + timedelta(days=30 * i)).strftime("%Y-%m-%d")
-                for i in range(months)
-            ]
             flat_values = [base_amount * (1 + 0.07 * t) for t in time_points]
             return MonteCarloProjections(
                 percentile5=[
@@ -279,116 +644,105 @@ class MonteCarloService(BaseService):
                 ],
             )
 
-        symbols = list(weights.keys())
-        mean_returns = np.array([returns_data[s]["mean_return"] for s in symbols])
-        volatilities = np.array([returns_data[s]["volatility"] for s in symbols])
-        weight_array = np.array([weights[s] for s in symbols])
-
-        portfolio_return = np.dot(weight_array, mean_returns)
-        portfolio_vol = np.sqrt(np.dot(weight_array**2, volatilities**2))
-
-        # Generate time series
-        np.random.seed(42)
-        projections_by_time = []
-
-        for t in time_points:
-            if t == 0:
-                projections_by_time.append([base_amount] * num_sims)
-                continue
-
-            sim_values = []
-            for _ in range(num_sims):
-                random_return = np.random.normal(
-                    portfolio_return * t, portfolio_vol * np.sqrt(t)
-                )
-                value = base_amount * (1 + random_return)
-                sim_values.append(max(value, 0))
-            projections_by_time.append(sim_values)
-
-        # Calculate percentiles
-        dates = [
-            (datetime.now() + timedelta(days=30 * i)).strftime("%Y-%m-%d")
-            for i in range(months)
-        ]
-
-        percentiles = {
-            5: [np.percentile(values, 5) for values in projections_by_time],
-            25: [np.percentile(values, 25) for values in projections_by_time],
-            50: [np.percentile(values, 50) for values in projections_by_time],
-            75: [np.percentile(values, 75) for values in projections_by_time],
-            95: [np.percentile(values, 95) for values in projections_by_time],
-        }
+        p5, p25, p50, p75, p95 = np.round(bands, 2).tolist()
 
         return MonteCarloProjections(
-            percentile5=[
-                ChartDataPoint(date=d, value=round(v, 2))
-                for d, v in zip(dates, percentiles[5])
-            ],
-            percentile25=[
-                ChartDataPoint(date=d, value=round(v, 2))
-                for d, v in zip(dates, percentiles[25])
-            ],
-            percentile50=[
-                ChartDataPoint(date=d, value=round(v, 2))
-                for d, v in zip(dates, percentiles[50])
-            ],
-            percentile75=[
-                ChartDataPoint(date=d, value=round(v, 2))
-                for d, v in zip(dates, percentiles[75])
-            ],
-            percentile95=[
-                ChartDataPoint(date=d, value=round(v, 2))
-                for d, v in zip(dates, percentiles[95])
-            ],
+            percentile5=[ChartDataPoint(date=d, value=v) for d, v in zip(dates, p5)],
+            percentile25=[ChartDataPoint(date=d, value=v) for d, v in zip(dates, p25)],
+            percentile50=[ChartDataPoint(date=d, value=v) for d, v in zip(dates, p50)],
+            percentile75=[ChartDataPoint(date=d, value=v) for d, v in zip(dates, p75)],
+            percentile95=[ChartDataPoint(date=d, value=v) for d, v in zip(dates, p95)],
         )
 
     def _calculate_outcomes(
-        self, final_values: List[float], base_amount: float
+        self, final_values: np.ndarray, estimator: OutcomeEstimator
     ) -> MonteCarloOutcomes:
         """Calculate outcome statistics"""
-        import numpy as np
+        return self._outcomes(
+            np.percentile(final_values, OUTCOME_PERCENTILES), estimator
+        )
 
-        final_array = np.array(final_values)
-        profit_count = np.sum(final_array > base_amount)
-        double_count = np.sum(final_array >= base_amount * 2)
+    def _outcomes(
+        self, percentiles: np.ndarray, estimator: OutcomeEstimator
+    ) -> MonteCarloOutcomes:
+        """Outcome statistics with the Monte Carlo standard error of each"""
+        p5, p50, p95 = percentiles
+        expected_value, value_error = estimator.value.estimate()
+        profit, profit_error = estimator.profit.estimate()
+        double, double_error = estimator.double.estimate()
+        errors = OutcomeStandardErrors(
+            probability_of_profit=round(profit_error * 100, 4),
+            probability_of_doubling=round(double_error * 100, 4),
+            expected_value=round(value_error, 4),
+        )
+        percentile_errors = estimator.percentile_errors()
+        if percentile_errors is not None:
+            errors.worst_case, errors.median, errors.best_case = np.round(
+                percentile_errors, 4
+            ).tolist()
 
         return MonteCarloOutcomes(
-            best_case=round(float(np.percentile(final_array, 95)), 2),
-            worst_case=round(float(np.percentile(final_array, 5)), 2),
-            median=round(float(np.median(final_array)), 2),
-            probability_of_profit=round(profit_count / len(final_values) * 100, 1),
-            probability_of_doubling=round(double_count / len(final_values) * 100, 1),
+            best_case=round(float(p95), 2),
+            worst_case=round(float(p5), 2),
+            median=round(float(p50), 2),
+            # Control-variate estimates can stray just outside [0, 1]
+            probability_of_profit=round(float(np.clip(profit, 0, 1)) * 100, 1),
+            probability_of_doubling=round(float(np.clip(double, 0, 1)) * 100, 1),
+            expected_value=round(expected_value, 2),
+            standard_error=errors,
         )
 
-    def _generate_distribution(self, final_values: List[float]) -> DistributionData:
+    def _generate_distribution(self, final_values: np.ndarray) -> DistributionData:
         """Generate return distribution for histogram"""
-        import numpy as np
-
         # Create return buckets
-        returns = [
-            (v - BASE_PORTFOLIO_AMOUNT) / BASE_PORTFOLIO_AMOUNT * 100
-            for v in final_values
-        ]  # Percentage returns
+        returns = (
+            (final_values - BASE_PORTFOLIO_AMOUNT) / BASE_PORTFOLIO_AMOUNT * 100
+        )  # Percentage returns
 
         # Create histogram
         hist, bin_edges = np.histogram(returns, bins=10)
-        probabilities = hist / len(returns) * 100
+        return_distribution = self._distribution_buckets(hist, bin_edges, len(returns))
+
+        return DistributionData(
+            final_values=np.round(final_values[:100], 2).tolist(),  # Sample for display
+            return_distribution=return_distribution,
+        )
+
+    def _distribution_buckets(
+        self, hist: np.ndarray, bin_edges: np.ndarray, total: int
+    ) -> List[Dict[str, float]]:
+        """Convert a return histogram into probability buckets"""
+        probabilities = hist / total * 100
 
         return_distribution = []
         for i in range(len(hist)):
             bucket_center = (bin_edges[i] + bin_edges[i + 1]) / 2
             return_distribution.append(
                 {
-                    "return": round(bucket_center, 1),
+                    "return": round(float(bucket_center), 1),
                     "probability": round(float(probabilities[i]), 1),
                 }
             )
+        return return_distribution
+
+    def _accumulated_outcomes(self, accumulator: PathAccumulator) -> MonteCarloOutcomes:
+        """Calculate outcome statistics from streamed simulation summaries"""
+        return self._outcomes(
+            accumulator.quantiles(OUTCOME_PERCENTILES)[:, -1], accumulator.estimator
+        )
+
+    def _accumulated_distribution(
+        self, accumulator: PathAccumulator
+    ) -> DistributionData:
+        """Generate return distribution from streamed simulation summaries"""
+        hist, value_edges = accumulator.final_histogram(bins=10)
+        bin_edges = (value_edges - BASE_PORTFOLIO_AMOUNT) / BASE_PORTFOLIO_AMOUNT * 100
 
         return DistributionData(
-            final_values=[
-                round(v, 2) for v in final_values[:100]
-            ],  # Sample for display
-            return_distribution=return_distribution,
+            final_values=[round(v, 2) for v in accumulator.sample],
+            return_distribution=self._distribution_buckets(
+                hist, bin_edges, accumulator.total
+            ),
         )
 
 
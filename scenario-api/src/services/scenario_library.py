@@ -0,0 +1,172 @@
+from ..config.settings import (
+    SCENARIO_CACHE_SIZE,
+    SCENARIO_CACHE_TTL,
+    SCENARIO_MISSING_TTL,
+    SCENARIO_RECOVERY_DAYS,
+)
+from ..dto.scenario import ScenarioEvent
+from ..utils.cache import TTLCache
+from ..utils.metrics import metrics
+from .symbol_stats import SymbolStats
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Built-in crisis windows, peak to trough of the broad US market
+SCENARIO_EVENTS: Dict[str, ScenarioEvent] = {
+    event.id: event
+    for event in [
+        ScenarioEvent(
+            id="dotcom-2000",
+            name="Dot-com Crash",
+            description="Collapse of the late-1990s technology bubble",
+            start_date="2000-03-24",
+            end_date="2002-10-09",
+            market_conditions="Tech-led bear market with recession and rate cuts",
+            severity="High",
+        ),
+        ScenarioEvent(
+            id="gfc-2008",
+            name="2008 Global Financial Crisis",
+            description="Housing and credit market collapse after the subprime crisis",
+            start_date="2007-10-09",
+            end_date="2009-03-09",
+            market_conditions="Banking crisis, credit freeze and deep global recession",
+            severity="Extreme",
+        ),
+        ScenarioEvent(
+            id="covid-2020",
+            name="2020 COVID-19 Crash",
+            description="Pandemic-driven sell-off as lockdowns spread worldwide",
+            start_date="2020-02-19",
+            end_date="2020-03-23",
+            market_conditions="Record volatility, liquidity stress and emergency easing",
+            severity="Extreme",
+        ),
+        ScenarioEvent(
+            id="rate-shock-2022",
+            name="2022 Rate Shock",
+            description="Stocks and bonds fall together as inflation forces rapid hikes",
+            start_date="2022-01-03",
+            end_date="2022-10-12",
+            market_conditions="Fastest Fed tightening in decades, high inflation",
+            severity="High",
+        ),
+    ]
+}
+
+
+class ScenarioWindow:
+    """Weekday calendar of a crisis window plus a recovery tail after it."""
+
+    __slots__ = ("event", "calendar", "window_length", "period_days")
+
+    def __init__(self, event: ScenarioEvent):
+        start = np.datetime64(event.start_date, "D")
+        end = np.datetime64(event.end_date, "D")
+        tail_end = end + np.timedelta64(SCENARIO_RECOVERY_DAYS, "D")
+        calendar = np.arange(start, tail_end + 1)
+        self.event = event
+        # Full calendar; days after today are dropped when it is read
+        self.calendar = calendar[np.is_busday(calendar)]
+        # Points inside the crisis window itself; the rest is the recovery tail
+        self.window_length = int(np.searchsorted(self.calendar, end, side="right"))
+        self.period_days = int((end - start).astype(int))
+
+    @property
+    def days(self) -> np.ndarray:
+        """Window calendar up to today; a recovery tail still in progress is cut."""
+        today = np.datetime64(date.today(), "D")
+        available = np.searchsorted(self.calendar, today, side="right")
+        return self.calendar[: max(available, self.window_length)]
+
+    def fetch_range(self) -> Tuple[str, str]:
+        """
+        Dates of history needed to slice this window.
+
+        Starts a week early so a window opening on a market holiday still
+        has a close to carry forward.
+        """
+        first = self.days[0] - np.timedelta64(7, "D")
+        return str(first), str(self.days[-1])
+
+    def relative_prices(self, stats: SymbolStats) -> np.ndarray:
+        """
+        Closes on every calendar day relative to the first one, NaN before listing.
+
+        Holidays and missing days carry the last close forward. Covers the
+        full calendar so slices cached on different days have one length;
+        callers trim them to :attr:`days`.
+        """
+        idx = np.searchsorted(stats.days, self.calendar, side="right") - 1
+        prices = np.full(len(self.calendar), np.nan)
+        listed = idx >= 0
+        if len(stats.closes) and stats.days[-1] >= self.calendar[0]:
+            prices[listed] = stats.closes[idx[listed]]
+        first = np.flatnonzero(~np.isnan(prices))
+        if len(first):
+            prices /= prices[first[0]]
+        return prices
+
+
+class ScenarioWindowStore:
+    """Relative price slices per (scenario, symbol), aligned on each window calendar."""
+
+    def __init__(self):
+        self.windows = {sid: ScenarioWindow(e) for sid, e in SCENARIO_EVENTS.items()}
+        self.cache = TTLCache(SCENARIO_CACHE_SIZE, SCENARIO_CACHE_TTL)
+        metrics.register_cache("scenario_windows", self.cache)
+
+    def lookup(
+        self, scenario_id: str, symbols: List[str]
+    ) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Cached slices for the symbols of one scenario, plus the symbols missing."""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        for symbol in symbols:
+            prices = self.cache.get((scenario_id, symbol))
+            if prices is None:
+                missing.append(symbol)
+            else:
+                found[symbol] = prices
+        return found, missing
+
+    def add(
+        self,
+        stats_map: Dict[str, SymbolStats],
+        scenario_ids: Optional[List[str]] = None,
+        requested: Sequence[str] = (),
+    ) -> None:
+        """
+        Slice histories into scenario windows and cache the results.
+
+        Symbols without any history, including ``requested`` ones missing
+        from ``stats_map``, are cached as all-NaN slices for
+        SCENARIO_MISSING_TTL, so they are not fetched again on every request.
+
+        Args:
+            stats_map: Per-symbol histories covering the windows to slice
+            scenario_ids: Windows to slice into, all of them by default
+            requested: Symbols that were fetched
+        """
+        scenario_ids = scenario_ids or list(self.windows)
+        empty = [s for s in requested if s not in stats_map]
+        for symbol, stats in stats_map.items():
+            if not len(stats.closes):
+                empty.append(symbol)
+                continue
+            for scenario_id in scenario_ids:
+                window = self.windows[scenario_id]
+                self.cache.set((scenario_id, symbol), window.relative_prices(stats))
+        for symbol in empty:
+            for scenario_id in scenario_ids:
+                calendar = self.windows[scenario_id].calendar
+                self.cache.set(
+                    (scenario_id, symbol),
+                    np.full(len(calendar), np.nan),
+                    SCENARIO_MISSING_TTL,
+                )
+
+
+# Shared store instance
+scenario_window_store = ScenarioWindowStore()
@@ -5,12 +5,23 @@ from ..dto.scenario import (
     PortfolioMetrics,
     ChartDataPoint,
     DrawdownDataPoint,
+    Recovery,
+    ScanWindow,
+    StressScanParams,
+    StressScanResult,
 )
 from ..utils.errors import BadRequest
+from ..utils.metrics import stage_seconds
 from .base_service import BaseService
-from ..config.settings import BASE_PORTFOLIO_AMOUNT
-import math
-from typing import Dict, List, Tuple, Any
+from .symbol_stats import SymbolStats, symbol_stats_store
+from ..config.settings import BASE_PORTFOLIO_AMOUNT, STRESS_TEST_FORWARD_FILL
+from ..engine.alignment import aligned_price_matrix
+from ..engine.analytics import SeriesAnalytics, recovery_point, running_drawdowns
+from ..engine.downsample import downsample_indices
+from ..engine.rolling import rolling_window_metrics, worst_windows
+from .scenario_library import SCENARIO_EVENTS, scenario_window_store
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,196 +33,361 @@ class StressTestService(BaseService):
     async def run_stress_test(self, params: StressTestParams) -> StressTestResult:
         """Run stress test analysis on portfolio using hub for market data."""
         logger.info(
-            f"Running stress test for portfolio {params.portfolio_id} mode={params.mode}"
+            "Running stress test for portfolio %s mode=%s",
+            params.portfolio_id,
+            params.mode,
         )
 
-        if params.mode != "historical":
-            raise BadRequest("Only historical mode is supported currently")
-
-        if not params.historical:
-            raise BadRequest("Historical date range is required")
-
         # Hub enriches payload with holdings; validate
         holdings = params.model_dump().get("holdings") or []
         if not holdings:
             raise BadRequest("Holdings are required to run stress test")
 
+        if params.mode == "scenario":
+            return await self._run_scenario(params, holdings)
+
+        if not params.historical:
+            raise BadRequest("Historical date range is required")
+        if params.mode == "scan":
+            self._validate_scan(params.scan)
+
         start_date = params.historical.get("start_date")
         end_date = params.historical.get("end_date")
         if not start_date or not end_date:
             raise BadRequest("start_date and end_date are required")
 
-        # Determine an appropriate server timeframe bucket from dates
-        timeframe = self._infer_timeframe(start_date, end_date)
+        try:
+            first_day = np.datetime64(start_date, "D")
+            last_day = np.datetime64(end_date, "D")
+        except ValueError:
+            raise BadRequest("start_date and end_date must be YYYY-MM-DD dates")
+        if first_day > last_day:
+            raise BadRequest("start_date must not be after end_date")
 
-        # Fetch historical data for all symbols via hub stock endpoint in parallel
+        # Fetch exactly the requested range for all symbols via the hub in
+        # parallel; the bucket is only a fallback label for the hub
+        timeframe = self._infer_timeframe(start_date, end_date)
         symbols = [h.get("symbol") for h in holdings if h.get("allocation", 0) > 0]
-        history_map = await self._fetch_histories(symbols, timeframe)
+        with stage_seconds.time("stress_test", "fetch"):
+            history_map = await self._fetch_histories(
+                symbols, timeframe, start_date, end_date
+            )
+        with stage_seconds.time("stress_test", "returns"):
+            stats_map = symbol_stats_store.get_many(
+                history_map, f"{start_date}/{end_date}"
+            )
 
-        # Compute combined portfolio series
-        base_amount = BASE_PORTFOLIO_AMOUNT
-        portfolio_series = self._compute_portfolio_series(
-            holdings, history_map, base_amount
-        )
+            # Compute combined portfolio series
+            base_amount = BASE_PORTFOLIO_AMOUNT
+            days, values = self._compute_portfolio_series(
+                holdings, stats_map, base_amount
+            )
 
         # Trim to requested date range if necessary
-        filtered_series = [
-            ChartDataPoint(date=p[0], value=p[1])
-            for p in portfolio_series
-            if start_date <= p[0] <= end_date
-        ]
-        if not filtered_series:
+        in_range = (days >= first_day) & (days <= last_day)
+        days, values = days[in_range], values[in_range]
+        if not len(values):
             # Fallback to single point base if no data
-            filtered_series = [
-                ChartDataPoint(date=start_date, value=base_amount),
-                ChartDataPoint(date=end_date, value=base_amount),
-            ]
-
-        # Compute drawdown series and metrics
-        drawdowns, max_drawdown = self._compute_drawdowns(filtered_series)
-        total_return = (
-            filtered_series[-1].value - filtered_series[0].value
-        ) / filtered_series[0].value
-        ann_return = self._annualize_return(total_return, start_date, end_date)
-        volatility = self._compute_volatility(filtered_series)  # fraction
-        sharpe = ann_return / volatility if volatility > 0 else 0.0
-        calmar = ann_return / abs(max_drawdown / 100.0) if max_drawdown != 0 else 0.0
-
-        metrics = PortfolioMetrics(
-            total_return=round(total_return, 6),
-            annualized_return=round(ann_return, 6),
-            volatility=round(volatility, 6),
-            sharpe_ratio=round(sharpe, 4),
-            max_drawdown=round(max_drawdown, 4),
-            calmar_ratio=round(calmar, 4),
-        )
+            days = np.array([first_day, last_day])
+            values = np.full(2, base_amount)
 
-        result = StressTestResult(
+        with stage_seconds.time("stress_test", "analytics"):
+            analytics = SeriesAnalytics(values, int((last_day - first_day).astype(int)))
+            scan = None
+            if params.mode == "scan":
+                scan = self._scan_windows(days, values, params.scan, params.max_points)
+            index = self._chart_index(days, values, analytics, params.max_points)
+        return StressTestResult(
             mode=params.mode,
             time_range={"start_date": start_date, "end_date": end_date},
             portfolio=Portfolio(id=params.portfolio_id, name="Portfolio"),
-            metrics=metrics,
-            chart_data=filtered_series,
-            drawdown_data=drawdowns,
+            metrics=self._metrics(analytics),
+            chart_data=self._chart_points(days[index], values[index]),
+            drawdown_data=self._drawdown_points(days, values, analytics, index),
+            recovery=self._recovery(days, analytics.recovery, analytics),
+            scan=scan,
         )
 
-        return result
+    def _validate_scan(self, scan: Optional[StressScanParams]) -> None:
+        """Check rolling-window scan parameters."""
+        if scan is None:
+            raise BadRequest("scan parameters are required in scan mode")
+        if scan.window < 1:
+            raise BadRequest("scan.window must be at least 1 trading day")
+        if scan.step < 1:
+            raise BadRequest("scan.step must be at least 1 trading day")
+        if scan.worst < 1:
+            raise BadRequest("scan.worst must be at least 1")
+
+    def _scan_windows(
+        self,
+        days: np.ndarray,
+        values: np.ndarray,
+        scan: StressScanParams,
+        max_points: Optional[int] = None,
+    ) -> StressScanResult:
+        """Metrics for every rolling window and the worst distinct windows."""
+        if len(values) <= scan.window:
+            raise BadRequest(
+                f"scan.window must be shorter than the {len(values)} trading days in range"
+            )
+        metrics = rolling_window_metrics(values, scan.window, scan.step)
+        starts, returns, drawdowns, volatilities = metrics
+        scores = {
+            "return": returns,
+            "max_drawdown": drawdowns,
+            # Highest volatility is worst
+            "volatility": -volatilities,
+        }[scan.rank_by]
+        worst = worst_windows(starts, scores, scan.window, scan.worst)
+
+        # Worst windows come from the full-resolution metrics; the curve is
+        # downsampled for charting and keeps as many of them as fit
+        index = downsample_indices(starts, scores, max_points, worst)
+        return StressScanResult(
+            window=scan.window,
+            step=scan.step,
+            rank_by=scan.rank_by,
+            worst_windows=self._scan_points(days, scan.window, metrics, worst),
+            curve=self._scan_points(days, scan.window, metrics, index),
+        )
+
+    def _scan_points(
+        self,
+        days: np.ndarray,
+        window: int,
+        metrics: Tuple[np.ndarray, ...],
+        positions: Sequence[int],
+    ) -> List[ScanWindow]:
+        """Rolling-window metrics at the given positions, in that order."""
+        positions = np.asarray(positions, dtype=np.int64)
+        starts, returns, drawdowns, volatilities = (m[positions] for m in metrics)
+        return [
+            ScanWindow(
+                start_date=start,
+                end_date=end,
+                total_return=r,
+                max_drawdown=dd,
+                volatility=vol,
+            )
+            for start, end, r, dd, vol in zip(
+                days[starts].astype(str).tolist(),
+                days[starts + window].astype(str).tolist(),
+                np.round(returns, 6).tolist(),
+                np.round(drawdowns, 4).tolist(),
+                np.round(volatilities, 6).tolist(),
+            )
+        ]
+
+    async def _run_scenario(
+        self, params: StressTestParams, holdings: List[Dict[str, Any]]
+    ) -> StressTestResult:
+        """Replay the portfolio through a built-in crisis window."""
+        scenario_id = (params.scenario or {}).get("scenario_id")
+        if scenario_id not in SCENARIO_EVENTS:
+            raise BadRequest(
+                f"scenario_id must be one of: {', '.join(SCENARIO_EVENTS)}"
+            )
+        window = scenario_window_store.windows[scenario_id]
+        event = window.event
+
+        weights: Dict[str, float] = {}
+        for h in holdings:
+            alloc = float(h.get("allocation", 0)) / 100.0
+            if alloc > 0:
+                weights[h.get("symbol")] = weights.get(h.get("symbol"), 0.0) + alloc
+
+        # Only symbols not already sliced for this window go to the hub
+        slices, missing = scenario_window_store.lookup(scenario_id, list(weights))
+        if missing:
+            logger.info("Scenario %s: fetching %d symbols", scenario_id, len(missing))
+            # Only this window's dates are needed, not the full history
+            start, end = window.fetch_range()
+            with stage_seconds.time("stress_test", "fetch"):
+                history_map = await self._fetch_histories(missing, "MAX", start, end)
+            stats_map = symbol_stats_store.get_many(history_map, f"{start}/{end}")
+            scenario_window_store.add(stats_map, [scenario_id], missing)
+            slices.update(scenario_window_store.lookup(scenario_id, missing)[0])
+
+        # Weighted sum of relative prices; unlisted assets contribute nothing
+        base_amount = BASE_PORTFOLIO_AMOUNT
+        days = window.days
+        symbols = list(slices)
+        if symbols:
+            # Slices span the full calendar; keep the days up to today
+            relative = np.column_stack([slices[s][: len(days)] for s in symbols])
+            values = base_amount * (
+                np.nan_to_num(relative) @ np.array([weights[s] for s in symbols])
+            )
+        else:
+            values = np.zeros(len(days))
+        values = np.round(values, 2)
+
+        keep = values > 0
+        days, values = days[keep], values[keep]
+        in_window = int(np.count_nonzero(keep[: window.window_length]))
+        if not in_window:
+            days = np.array(
+                [np.datetime64(event.start_date), np.datetime64(event.end_date)]
+            )
+            values = np.full(2, base_amount)
+            in_window = 2
+
+        analytics = SeriesAnalytics(values[:in_window], window.period_days)
+        # Recovery may happen after the window ends, so search the tail too
+        peaks, drawdowns = running_drawdowns(values)
+        point = recovery_point(values, peaks, drawdowns, trough_within=in_window)
+        recovery = self._recovery(days, point, analytics)
+
+        days, values = days[:in_window], values[:in_window]
+        index = self._chart_index(days, values, analytics, params.max_points)
+        return StressTestResult(
+            mode=params.mode,
+            time_range={"start_date": event.start_date, "end_date": event.end_date},
+            portfolio=Portfolio(id=params.portfolio_id, name="Portfolio"),
+            metrics=self._metrics(analytics),
+            chart_data=self._chart_points(days[index], values[index]),
+            drawdown_data=self._drawdown_points(days, values, analytics, index),
+            recovery=recovery,
+            scenario=event,
+        )
+
+    async def preload_scenarios(self, symbols: List[str]) -> None:
+        """Slice common tickers into every crisis window ahead of requests."""
+        # A symbol is fetched again if any window lost its slice
+        missing = sorted(
+            {
+                symbol
+                for scenario_id in SCENARIO_EVENTS
+                for symbol in scenario_window_store.lookup(scenario_id, symbols)[1]
+            }
+        )
+        if not missing:
+            return
+        try:
+            history_map = await self._fetch_histories(missing, "MAX")
+            scenario_window_store.add(
+                symbol_stats_store.get_many(history_map, "MAX"), requested=missing
+            )
+        except Exception as e:
+            logger.warning(
+                "Crisis scenario preload failed: %s: %s", type(e).__name__, e
+            )
+            return
+        logger.info("Preloaded crisis scenarios for %d symbols", len(history_map))
+
+    def _metrics(self, analytics: SeriesAnalytics) -> PortfolioMetrics:
+        """Rounded response metrics."""
+        return PortfolioMetrics(
+            total_return=round(analytics.total_return, 6),
+            annualized_return=round(analytics.annualized_return, 6),
+            volatility=round(analytics.volatility, 6),
+            sharpe_ratio=round(analytics.sharpe_ratio, 4),
+            max_drawdown=round(analytics.max_drawdown, 4),
+            calmar_ratio=round(analytics.calmar_ratio, 4),
+        )
 
     def _compute_portfolio_series(
         self,
         holdings: List[Dict[str, Any]],
-        history_map: Dict[str, List[Dict[str, float]]],
+        stats_map: Dict[str, SymbolStats],
         base_amount: float,
-    ) -> List[Tuple[str, float]]:
-        """Compute portfolio value series from holdings and historical data."""
-        # Build set of all dates
-        all_dates = set()
-        for sym, arr in history_map.items():
-            for p in arr:
-                d = p.get("date")
-                if d:
-                    all_dates.add(d)
-        if not all_dates:
-            return []
-        sorted_dates = sorted(all_dates)
-
-        # Precompute shares per asset using first available price
-        shares_by_symbol: Dict[str, float] = {}
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute (dates, values) portfolio series from holdings and cached price arrays."""
+        # Shares per asset are bought at the first available price
+        symbols: List[str] = []
+        shares: List[float] = []
         for h in holdings:
             sym = h.get("symbol")
             alloc = float(h.get("allocation", 0)) / 100.0
             if alloc <= 0:
                 continue
-            series = history_map.get(sym, [])
-            if not series:
+            stats = stats_map.get(sym)
+            if stats is None or not len(stats.closes):
                 continue
-            first_price = None
-            for p in series:
-                cp = p.get("close")
-                if cp and cp > 0:
-                    first_price = cp
-                    break
-            if not first_price:
-                continue
-            allocated_amount = base_amount * alloc
-            shares_by_symbol[sym] = allocated_amount / first_price
-
-        # Compute portfolio value per date
-        out: List[Tuple[str, float]] = []
-        for d in sorted_dates:
-            total_value = 0.0
-            for sym, shares in shares_by_symbol.items():
-                series = history_map.get(sym, [])
-                # find price at date d (exact match)
-                price = None
-                for p in series:
-                    if p.get("date") == d:
-                        price = p.get("close")
-                        break
-                if price:
-                    total_value += shares * price
-            if total_value > 0:
-                out.append((d, round(total_value, 2)))
-        return out
-
-    def _compute_drawdowns(
-        self, series: List[ChartDataPoint]
-    ) -> Tuple[List[DrawdownDataPoint], float]:
-        """Compute drawdown series and maximum drawdown."""
-        peak = series[0].value if series else 0.0
-        max_dd = 0.0
-        out: List[DrawdownDataPoint] = []
-        for pt in series:
-            if pt.value > peak:
-                peak = pt.value
-            drawdown = 0.0 if peak == 0 else (pt.value - peak) / peak * 100.0
-            max_dd = min(max_dd, drawdown)
-            out.append(
-                DrawdownDataPoint(
-                    date=pt.date,
-                    drawdown=round(drawdown, 4),
-                    peak=round(peak, 2),
-                    value=pt.value,
-                )
-            )
-        return out, max_dd
+            symbols.append(sym)
+            shares.append(base_amount * alloc / float(stats.closes[0]))
 
-    def _annualize_return(
-        self, total_return_frac: float, start_date: str, end_date: str
-    ) -> float:
-        """Convert total return to annualized return."""
-        from datetime import datetime
+        # Dense (dates x symbols) closes over the union of all fetched dates
+        days, prices = aligned_price_matrix(
+            [stats.days for stats in stats_map.values()],
+            [stats.closes for stats in stats_map.values()],
+            STRESS_TEST_FORWARD_FILL,
+        )
+        if not len(days) or not symbols:
+            return np.empty(0, dtype="datetime64[D]"), np.empty(0)
+        column_of = {sym: i for i, sym in enumerate(stats_map)}
+        columns = [column_of[sym] for sym in symbols]
 
-        fmt = "%Y-%m-%d"
-        try:
-            d0 = datetime.strptime(start_date, fmt)
-            d1 = datetime.strptime(end_date, fmt)
-        except Exception:
-            return total_return_frac
-        days = max((d1 - d0).days, 1)
-        years = days / 365.0
-        if years <= 0:
-            return total_return_frac
-        return math.pow(1 + total_return_frac, 1 / years) - 1
-
-    def _compute_volatility(self, series: List[ChartDataPoint]) -> float:
-        """Calculate portfolio volatility from price series."""
-        # Simple volatility estimate: std dev of daily returns (fraction) scaled by sqrt(N)
-        if len(series) < 2:
-            return 0.0
-        rets: List[float] = []
-        prev = series[0].value
-        for pt in series[1:]:
-            if prev > 0 and pt.value > 0:
-                rets.append((pt.value - prev) / prev)
-            prev = pt.value
-        if not rets:
-            return 0.0
-        mean = sum(rets) / len(rets)
-        var = sum((r - mean) ** 2 for r in rets) / len(rets)
-        std = math.sqrt(var)
-        # Scale by sqrt(N) to reflect overall period; leave as fraction
-        return std * math.sqrt(len(rets))
+        # Assets without a price on a date contribute nothing to its value
+        values = np.nan_to_num(prices[:, columns]) @ np.array(shares)
+        keep = values > 0
+        return days[keep], np.round(values[keep], 2)
+
+    def _chart_index(
+        self,
+        days: np.ndarray,
+        values: np.ndarray,
+        analytics: SeriesAnalytics,
+        max_points: Optional[int],
+    ) -> np.ndarray:
+        """
+        Points of the series to chart, downsampled with LTTB to ``max_points``.
+
+        The peak, trough and recovery of the maximum drawdown are always kept
+        so the downsampled chart shows the same drawdown as the metrics.
+        """
+        if max_points is None or len(values) <= max_points:
+            return np.arange(len(values))
+        trough = int(np.argmin(analytics.drawdowns))
+        keep = [int(np.argmax(values[: trough + 1])), trough]
+        if analytics.recovery is not None:
+            keep.append(analytics.recovery[1])
+        return downsample_indices(days.astype(np.int64), values, max_points, keep)
+
+    def _chart_points(
+        self, days: np.ndarray, values: np.ndarray
+    ) -> List[ChartDataPoint]:
+        """Portfolio value chart points for the response."""
+        return [
+            ChartDataPoint(date=d, value=v)
+            for d, v in zip(days.astype(str).tolist(), values.tolist())
+        ]
+
+    def _drawdown_points(
+        self,
+        days: np.ndarray,
+        values: np.ndarray,
+        analytics: SeriesAnalytics,
+        index: np.ndarray,
+    ) -> List[DrawdownDataPoint]:
+        """Drawdown chart points at ``index`` for the response."""
+        return [
+            DrawdownDataPoint(date=d, drawdown=dd, peak=pk, value=v)
+            for d, dd, pk, v in zip(
+                days[index].astype(str).tolist(),
+                np.round(analytics.drawdowns[index], 4).tolist(),
+                np.round(analytics.peaks[index], 2).tolist(),
+                values[index].tolist(),
+            )
+        ]
+
+    def _recovery(
+        self,
+        days: np.ndarray,
+        point: Optional[Tuple[int, int]],
+        analytics: SeriesAnalytics,
+    ) -> Optional[Recovery]:
+        """Recovery from the maximum drawdown, if the series regained its peak."""
+        if point is None:
+            return None
+        trough, recovered = point
+        return Recovery(
+            # Calendar days from the trough back to the prior peak value
+            time_to_recover=int((days[recovered] - days[trough]).astype(int)),
+            max_drawdown=round(analytics.max_drawdown, 4),
+            recovery_date=str(days[recovered]),
+        )
 
 
 # Service instance
@@ -0,0 +1,79 @@
+from ..config.settings import SYMBOL_STATS_CACHE_SIZE, SYMBOL_STATS_TTL
+from ..utils.cache import TTLCache
+from ..utils.metrics import metrics
+from ..utils.wire import PriceHistory
+from typing import Dict, Sequence
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+class SymbolStats:
+    """Compact close-price and daily-return arrays for one symbol."""
+
+    __slots__ = (
+        "symbol",
+        "days",
+        "closes",
+        "returns",
+        "return_dates",
+        "mean_return",
+        "volatility",
+    )
+
+    def __init__(self, symbol: str, days: Sequence, closes: Sequence[float]):
+        """
+        Args:
+            symbol: Ticker symbol
+            days: Price dates as datetime64 or ISO strings, ascending
+            closes: Close prices parallel to ``days``
+        """
+        self.symbol = symbol
+        # datetime64 days for fast sorting and alignment
+        self.days = np.asarray(days, dtype="datetime64[D]")
+        self.closes = np.asarray(closes, dtype=np.float64)
+        if len(self.closes) >= 2:
+            self.returns = np.diff(self.closes) / self.closes[:-1]
+            self.mean_return = float(np.mean(self.returns)) * TRADING_DAYS
+            self.volatility = float(np.std(self.returns)) * np.sqrt(TRADING_DAYS)
+        else:
+            self.returns = np.empty(0)
+            self.mean_return = 0.0
+            self.volatility = 0.0
+        self.return_dates = self.days[1:]
+
+
+class SymbolStatsStore:
+    """Per-symbol statistics keyed by symbol, timeframe and last price date."""
+
+    def __init__(self):
+        self.cache = TTLCache(SYMBOL_STATS_CACHE_SIZE, SYMBOL_STATS_TTL)
+        metrics.register_cache("symbol_stats", self.cache)
+
+    def get(self, symbol: str, timeframe: str, history: PriceHistory) -> SymbolStats:
+        """Return cached statistics for a price history, computing them on a miss."""
+        last_date = history.last_date
+        key = (symbol, timeframe.upper(), last_date)
+        if last_date:
+            stats = self.cache.get(key)
+            if stats is not None:
+                return stats
+
+        valid = history.closes > 0
+        stats = SymbolStats(symbol, history.days[valid], history.closes[valid])
+        if last_date:
+            self.cache.set(key, stats)
+        return stats
+
+    def get_many(
+        self, history_map: Dict[str, PriceHistory], timeframe: str
+    ) -> Dict[str, SymbolStats]:
+        """Statistics for every symbol in a history map."""
+        return {
+            symbol: self.get(symbol, timeframe, prices)
+            for symbol, prices in history_map.items()
+        }
+
+
+# Shared store instance
+symbol_stats_store = SymbolStatsStore()
@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from ..config.settings import (
+    HUB_DNS_CACHE_TTL,
+    HUB_KEEPALIVE_TIMEOUT,
+    HUB_MAX_CONCURRENT_REQUESTS,
+    HUB_POOL_LIMIT,
+    HUB_POOL_LIMIT_PER_HOST,
+    HUB_REQUEST_TIMEOUT,
+)
+
+
+class HubSession:
+    """
+    Long-lived pooled aiohttp session for requests to the hub.
+
+    Opened on startup and closed on shutdown so connections and DNS lookups
+    are reused across requests. A semaphore bounds concurrent requests, so a
+    portfolio with many holdings queues for sockets instead of opening one
+    per symbol.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def start(self) -> None:
+        """Create the connector and session; a no-op when already open."""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=HUB_POOL_LIMIT,
+            limit_per_host=HUB_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HUB_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HUB_DNS_CACHE_TTL,
+            use_dns_cache=True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HUB_REQUEST_TIMEOUT),
+        )
+        self._semaphore = asyncio.Semaphore(HUB_MAX_CONCURRENT_REQUESTS)
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection."""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    @asynccontextmanager
+    async def get(self, url: str) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET ``url`` through the pool, waiting for a free request slot."""
+        # Opened lazily when used outside the app lifespan (scripts, tests)
+        await self.start()
+        self.waiting += 1
+        async with self._semaphore:
+            self.waiting -= 1
+            self.in_flight += 1
+            self.requests += 1
+            try:
+                async with self._session.get(url) as resp:
+                    yield resp
+            except Exception:
+                self.failures += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool limits, connection counts and request counters."""
+        stats: Dict[str, Any] = {
+            "open": self._session is not None and not self._session.closed,
+            "limit": HUB_POOL_LIMIT,
+            "limit_per_host": HUB_POOL_LIMIT_PER_HOST,
+            "max_concurrent_requests": HUB_MAX_CONCURRENT_REQUESTS,
+            "requests": self.requests,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "connections_in_use": 0,
+            "connections_idle": 0,
+        }
+        connector = self._session.connector if stats["open"] else None
+        if connector is not None:
+            # aiohttp keeps no public counters; read the pool bookkeeping
+            acquired = getattr(connector, "_acquired", ())
+            idle = getattr(connector, "_conns", {})
+            stats["connections_in_use"] = len(acquired)
+            stats["connections_idle"] = sum(len(conns) for conns in idle.values())
+        return stats
+
+
+# Shared session instance
+hub_session = HubSession()
@@ -0,0 +1,183 @@
+"""
+Latency histograms and counters rendered in the Prometheus text format.
+
+Observations are recorded in-process and read by the ``/metrics`` route.
+With METRICS_ENABLED off, timers are a shared no-op context and observe()
+returns immediately, so instrumented code costs one attribute check.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from ..config.settings import METRICS_ENABLED
+from .cache import TTLCache
+
+# Seconds; spans a cached lookup up to a multi-million path simulation
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+_NOOP_TIMER = nullcontext()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional positional label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+        if not self.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, *labels: str):
+        """Context manager observing the elapsed wall time of its block."""
+        if not self.enabled:
+            return _NOOP_TIMER
+        return self._timer(labels)
+
+    @contextmanager
+    def _timer(self, labels: Tuple[str, ...]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = [(k, list(v[0]), v[1]) for k, v in sorted(self._series.items())]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(
+                    self.labelnames + ("le",), labels + (le,)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Histograms plus collectors that read existing counters at scrape time."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._histograms: List[Histogram] = []
+        self._caches: Dict[str, TTLCache] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, buckets, self.enabled)
+        self._histograms.append(histogram)
+        return histogram
+
+    def register_cache(self, name: str, cache: TTLCache) -> None:
+        """Export a cache's hit/miss counters and size under ``cache=name``."""
+        self._caches[name] = cache
+
+    def register_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Add a callable returning extra exposition lines on each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        if not self.enabled:
+            return ""
+        lines: List[str] = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        if self._caches:
+            stats = {name: cache.stats() for name, cache in self._caches.items()}
+            for metric, key, kind, documentation in (
+                ("scenario_cache_hits_total", "hits", "counter", "Cache hits"),
+                ("scenario_cache_misses_total", "misses", "counter", "Cache misses"),
+                ("scenario_cache_entries", "size", "gauge", "Cached entries"),
+            ):
+                lines.append(f"# HELP {metric} {documentation}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for name, values in stats.items():
+                    lines.append(f'{metric}{{cache="{name}"}} {values[key]}')
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry and the hot-path metrics recorded into it
+metrics = MetricsRegistry(METRICS_ENABLED)
+
+stage_seconds = metrics.histogram(
+    "scenario_stage_duration_seconds",
+    "Time spent in each stage of a request",
+    ("operation", "stage"),
+)
+hub_request_seconds = metrics.histogram(
+    "scenario_hub_request_duration_seconds",
+    "Latency of batched hub history requests",
+    ("outcome",),
+)
+symbol_fetch_seconds = metrics.histogram(
+    "scenario_symbol_fetch_duration_seconds",
+    "Time until one symbol's history is available from the hub",
+)
@@ -0,0 +1,59 @@
+"""Opt-in fast JSON responses (kept in step with the other API's copy)."""
+
+import gzip
+from typing import Any, Mapping, Optional
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+from ..config.settings import GZIP_COMPRESS_LEVEL, GZIP_MIN_SIZE
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the request's Accept-Encoding allows a gzip body."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        weight = params.strip()
+        if not weight.startswith("q="):
+            return True
+        try:
+            return float(weight[2:]) > 0
+        except ValueError:
+            return True
+    return False
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded straight to bytes by pydantic-core.
+
+    Routes opt in by returning it: FastAPI then skips validating the model
+    again against response_model and the stdlib json encoder. Bodies of at
+    least GZIP_MIN_SIZE bytes are gzipped when the request accepts it.
+
+    NaN and +/-Inf floats are written as ``null``; the JSONResponse path
+    rejected them (allow_nan=False) and the request failed with a 500.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        request: Optional[Request] = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(content, status_code=status_code, headers=headers)
+        if request is None or len(self.body) < GZIP_MIN_SIZE:
+            return
+        self.headers.add_vary_header("Accept-Encoding")
+        if accepts_gzip(request):
+            self.body = gzip.compress(self.body, compresslevel=GZIP_COMPRESS_LEVEL)
+            self.headers["content-encoding"] = "gzip"
+            self.headers["content-length"] = str(len(self.body))
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same task instead of repeating it. Each caller awaits a
+    shielded view, so one cancelled request does not cancel the shared work
+    for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def submit(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> "asyncio.Future[Any]":
+        """
+        Start ``fn`` for ``key`` unless a call for it is already in flight.
+
+        The key is claimed immediately and a future is returned, so a caller
+        can register several keys before awaiting any of them and no other
+        request can start the same work in between.
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.shared += 1
+        return asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for ``key`` is currently running."""
+        return key in self._in_flight
+
+    def stats(self) -> Dict[str, int]:
+        """Calls made, calls served by another caller's request, and keys in flight."""
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight),
+        }
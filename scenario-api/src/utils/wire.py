@@ -0,0 +1,66 @@
+"""
+Decoding of the packed binary price history format served by the hub.
+
+Layout, all little-endian, one block per symbol:
+
+    uint16  symbol length in bytes
+    bytes   symbol (ASCII)
+    uint32  number of points n
+    int32   n day offsets since 1970-01-01
+    float64 n closes
+
+A symbol without data is a block with n = 0.
+"""
+
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+BINARY_MEDIA_TYPE = "application/octet-stream"
+
+
+class PriceHistory:
+    """Close prices of one symbol as parallel day and close arrays."""
+
+    __slots__ = ("days", "closes")
+
+    def __init__(self, days: np.ndarray, closes: np.ndarray):
+        self.days = days
+        self.closes = closes
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    @property
+    def last_date(self) -> Optional[str]:
+        """ISO date of the latest close, None when empty."""
+        return str(self.days[-1]) if len(self.days) else None
+
+    @classmethod
+    def empty(cls) -> "PriceHistory":
+        return cls(np.empty(0, dtype="datetime64[D]"), np.empty(0))
+
+
+def decode_histories(payload: bytes) -> Dict[str, PriceHistory]:
+    """
+    Decode concatenated binary history blocks.
+
+    Day and close arrays are zero-copy ``np.frombuffer`` views of the payload
+    (days are converted to datetime64[D]).
+    """
+    histories: Dict[str, PriceHistory] = {}
+    offset = 0
+    while offset < len(payload):
+        (name_length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        symbol = payload[offset : offset + name_length].decode("ascii")
+        offset += name_length
+        (count,) = struct.unpack_from("<I", payload, offset)
+        offset += 4
+        days = np.frombuffer(payload, dtype="<i4", count=count, offset=offset)
+        offset += 4 * count
+        closes = np.frombuffer(payload, dtype="<f8", count=count, offset=offset)
+        offset += 8 * count
+        histories[symbol] = PriceHistory(days.astype("datetime64[D]"), closes)
+    return histories
@@ -0,0 +1,98 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.dto.scenario import MonteCarloBatchParams, MonteCarloParams
+from src.engine.parallel import shutdown_process_pool
+from src.services.monte_carlo_service import monte_carlo_service
+from src.utils.wire import PriceHistory
+
+
+def price_history(seed, start="2019-01-01", num_days=1260):
+    """Random-walk daily closes starting at ``start``."""
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64(start) + np.arange(num_days)
+    return PriceHistory(
+        dates, 100 * np.cumprod(1 + rng.normal(0.0004, 0.012, num_days))
+    )
+
+
+HISTORIES = {
+    "AAA": price_history(1),
+    "BBB": price_history(2),
+    "CCC": price_history(3),
+    # No dates in common with the others
+    "LATE": price_history(4, start="2024-06-01", num_days=200),
+}
+
+PORTFOLIO = [{"symbol": "AAA", "allocation": 60}, {"symbol": "BBB", "allocation": 40}]
+
+
+@pytest.fixture(autouse=True)
+def fake_hub(monkeypatch):
+    async def fetch_histories(symbols, timeframe, *args, **kwargs):
+        return {s: HISTORIES[s] for s in symbols}
+
+    monkeypatch.setattr(monte_carlo_service, "_fetch_histories", fetch_histories)
+    monte_carlo_service.result_cache.clear()
+    yield
+    shutdown_process_pool()
+
+
+def run_batch(portfolios, simulations=2000, seed=7):
+    async def collect():
+        params = MonteCarloBatchParams(
+            portfolios=[
+                {"portfolio_id": i, "holdings": holdings}
+                for i, holdings in enumerate(portfolios)
+            ],
+            time_horizon=5,
+            simulations=simulations,
+            confidence_interval=95,
+            seed=seed,
+        )
+        results = await monte_carlo_service.run_monte_carlo_batch(params)
+        return [response.data async for response in results]
+
+    return asyncio.run(collect())
+
+
+def assert_same_result(left, right):
+    outcomes = left.outcomes.model_dump()
+    expected = right.outcomes.model_dump()
+    errors = outcomes.pop("standard_error")
+    assert errors == pytest.approx(expected.pop("standard_error"), abs=1e-3)
+    assert outcomes == pytest.approx(expected, abs=0.011)
+    for band, points in left.projections.model_dump().items():
+        values = [p.value for p in getattr(right.projections, band)]
+        assert [p["value"] for p in points] == pytest.approx(values, abs=0.011)
+
+
+def test_batched_portfolio_reproduces_the_single_correlated_run():
+    single = asyncio.run(
+        monte_carlo_service.run_monte_carlo(
+            MonteCarloParams(
+                portfolio_id=0,
+                time_horizon=5,
+                simulations=2000,
+                confidence_interval=95,
+                holdings=PORTFOLIO,
+                mode="correlated",
+                seed=7,
+            )
+        )
+    )
+    batched = run_batch([PORTFOLIO, [{"symbol": "CCC", "allocation": 100}]])[0]
+    assert_same_result(batched, single)
+
+
+def test_unrelated_portfolios_do_not_change_a_batched_result():
+    alone = run_batch([PORTFOLIO])[0]
+    together = run_batch(
+        [
+            PORTFOLIO,
+            [{"symbol": "CCC", "allocation": 50}, {"symbol": "LATE", "allocation": 50}],
+        ]
+    )[0]
+    assert_same_result(together, alone)
@@ -0,0 +1,60 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.dto.scenario import StressTestParams
+from src.services.scenario_library import scenario_window_store
+from src.services.stress_test_service import stress_test_service
+from src.utils.wire import PriceHistory
+
+# Listed after the 2008 crisis window and its recovery tail
+LISTED = np.datetime64("2013-01-02")
+
+
+@pytest.fixture
+def hub_calls(monkeypatch):
+    calls = []
+
+    async def fetch_histories(symbols, timeframe, start=None, end=None):
+        calls.append(list(symbols))
+        histories = {}
+        for symbol in symbols:
+            days = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+            days = days[np.is_busday(days)]
+            if symbol == "LATE":
+                days = days[days >= LISTED]
+                if not len(days):
+                    # The hub omits symbols with no history in the range
+                    continue
+            histories[symbol] = PriceHistory(days, np.linspace(100, 80, len(days)))
+        return histories
+
+    monkeypatch.setattr(stress_test_service, "_fetch_histories", fetch_histories)
+    scenario_window_store.cache.clear()
+    yield calls
+    scenario_window_store.cache.clear()
+
+
+def run_gfc(holdings):
+    params = StressTestParams(
+        portfolio_id=1,
+        mode="scenario",
+        scenario={"scenario_id": "gfc-2008"},
+        holdings=holdings,
+    )
+    return asyncio.run(stress_test_service.run_stress_test(params))
+
+
+def test_symbol_without_window_history_is_served_from_cache(hub_calls):
+    holdings = [
+        {"symbol": "OLD", "allocation": 80},
+        {"symbol": "LATE", "allocation": 20},
+    ]
+    first = run_gfc(holdings)
+    second = run_gfc(holdings)
+
+    assert hub_calls == [["OLD", "LATE"]]
+    assert second.metrics == first.metrics
+    found, missing = scenario_window_store.lookup("gfc-2008", ["LATE"])
+    assert not missing and np.isnan(found["LATE"]).all()
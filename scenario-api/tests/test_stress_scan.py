@@ -0,0 +1,48 @@
+import numpy as np
+
+from src.dto.scenario import StressScanParams
+from src.engine.rolling import rolling_window_metrics
+from src.services.stress_test_service import stress_test_service
+
+
+def scan_inputs(num_days=1500):
+    """Business days and a random-walk portfolio value series."""
+    days = np.arange(
+        np.datetime64("2015-01-01"), np.datetime64("2025-01-01"), dtype="datetime64[D]"
+    )
+    days = days[np.is_busday(days)][:num_days]
+    rng = np.random.default_rng(3)
+    values = 10000 * np.cumprod(1 + rng.normal(0.0003, 0.012, num_days))
+    return days, values
+
+
+def test_worst_windows_survive_a_smaller_chart_budget():
+    days, values = scan_inputs()
+    scan = StressScanParams(window=20, step=1, worst=30)
+    result = stress_test_service._scan_windows(days, values, scan, max_points=20)
+
+    assert len(result.curve) <= 20
+    assert len(result.worst_windows) == 30
+    starts = [w.start_date for w in result.worst_windows]
+    assert len(set(starts)) == 30
+
+    # Worst first, and each entry matches its full-resolution window
+    window_starts, returns, _, _ = rolling_window_metrics(values, 20, 1)
+    by_start = dict(zip(days[window_starts].astype(str).tolist(), returns))
+    ranked = [w.total_return for w in result.worst_windows]
+    assert ranked == sorted(ranked)
+    for window in result.worst_windows:
+        assert window.total_return == round(float(by_start[window.start_date]), 6)
+
+    # Distinct windows do not overlap
+    positions = np.sort(np.searchsorted(days, np.array(starts, dtype="datetime64[D]")))
+    assert np.diff(positions).min() >= 20
+
+
+def test_worst_windows_are_clamped_to_the_distinct_windows_available():
+    days, values = scan_inputs(num_days=100)
+    scan = StressScanParams(window=20, step=1, worst=30)
+    result = stress_test_service._scan_windows(days, values, scan, max_points=10)
+
+    assert 1 <= len(result.worst_windows) <= 5
+    assert len(result.curve) <= 10
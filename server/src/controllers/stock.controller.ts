@@ -4,8 +4,11 @@ import {
   stockSearchSchema,
   stockSymbolSchema,
   stockHistorySchema,
+  stockHistoryBatchSchema,
+  HistoricalDataPoint,
 } from "../dto/stock.dto";
 import { BadRequest } from "../utils/errors";
+import { encodeHistoryBinary } from "../utils/wire";
 
 export class StockController {
   async searchStocks(
@@ -50,24 +53,69 @@ export class StockController {
   ): Promise<void> {
     try {
       const { symbol } = req.params;
-      const { period } = req.query;
+      const { period, start, end } = req.query;
 
       if (!symbol) throw BadRequest("Symbol is required");
 
       const validated = stockHistorySchema.parse({
         symbol,
         period: period as string,
+        start: start as string | undefined,
+        end: end as string | undefined,
       });
 
       const history = await stockService.getStockHistory(
         validated.symbol,
-        validated.period
+        validated.period,
+        validated.start,
+        validated.end
       );
       res.json({ success: true, data: history });
     } catch (error) {
       next(error);
     }
   }
+
+  async getStockHistories(
+    req: Request,
+    res: Response,
+    next: NextFunction
+  ): Promise<void> {
+    try {
+      const { symbols, period, start, end, format } = req.query;
+
+      const validated = stockHistoryBatchSchema.parse({
+        symbols: typeof symbols === "string" ? symbols.split(",") : [],
+        period: period as string,
+        start: start as string | undefined,
+        end: end as string | undefined,
+        format: format as string | undefined,
+      });
+
+      const histories = await stockService.getStockHistories(
+        validated.symbols,
+        validated.period,
+        validated.start,
+        validated.end
+      );
+
+      if (validated.format === "binary") {
+        res.type("application/octet-stream").send(encodeHistoryBinary(histories));
+        return;
+      }
+      if (validated.format === "columns") {
+        res.json({ success: true, data: histories });
+        return;
+      }
+      const rows: Record<string, HistoricalDataPoint[]> = {};
+      for (const [symbol, { dates, closes }] of Object.entries(histories)) {
+        rows[symbol] = dates.map((date, i) => ({ date, close: closes[i]! }));
+      }
+      res.json({ success: true, data: rows });
+    } catch (error) {
+      next(error);
+    }
+  }
 }
 
 export const stockController = new StockController();
@@ -6,8 +6,10 @@ export const stressTestSchema = z.object({
     .number()
     .int()
     .positive("Portfolio ID must be a positive integer"),
-  mode: z.enum(["historical", "scenario"], {
-    errorMap: () => ({ message: "Mode must be 'historical' or 'scenario'" }),
+  mode: z.enum(["historical", "scenario", "scan"], {
+    errorMap: () => ({
+      message: "Mode must be 'historical', 'scenario' or 'scan'",
+    }),
   }),
   historical: z
     .object({
@@ -20,6 +22,17 @@ export const stressTestSchema = z.object({
       scenario_id: z.string().optional(),
     })
     .optional(),
+  // Rolling-window scan over the historical range; window/step in trading days
+  scan: z
+    .object({
+      window: z.number().int().positive(),
+      step: z.number().int().positive().optional(),
+      worst: z.number().int().positive().optional(),
+      rank_by: z.enum(["return", "max_drawdown", "volatility"]).optional(),
+    })
+    .optional(),
+  // Downsample chart series to about this many points
+  max_points: z.number().int().min(10).optional(),
   // Enriched by server from portfolio holdings
   holdings: z
     .array(
@@ -53,6 +66,12 @@ export const monteCarloSchema = z.object({
     .int()
     .min(50)
     .max(99, "Confidence interval must be between 50 and 99"),
+  mode: z.enum(["independent", "correlated", "bootstrap"]).optional(),
+  seed: z.number().int().min(0).optional(),
+  variance_reduction: z
+    .enum(["none", "antithetic", "control_variate", "sobol"])
+    .optional(),
+  max_points: z.number().int().min(10).optional(),
   // Enriched by server from portfolio holdings
   holdings: z
     .array(
@@ -112,8 +131,24 @@ export interface Recovery {
   recovery_date: string;
 }
 
+export interface ScanWindow {
+  start_date: string;
+  end_date: string;
+  total_return: number;
+  max_drawdown: number;
+  volatility: number;
+}
+
+export interface StressScanResult {
+  window: number;
+  step: number;
+  rank_by: string;
+  worst_windows: ScanWindow[];
+  curve: ScanWindow[];
+}
+
 export interface StressTestResult {
-  mode: "historical" | "scenario";
+  mode: "historical" | "scenario" | "scan";
   time_range: {
     start_date: string;
     end_date: string;
@@ -124,6 +159,7 @@ export interface StressTestResult {
   drawdown_data: DrawdownDataPoint[];
   recovery?: Recovery;
   scenario?: ScenarioEvent;
+  scan?: StressScanResult;
 }
 
 export interface MonteCarloProjections {
@@ -134,12 +170,23 @@ export interface MonteCarloProjections {
   percentile95: ChartDataPoint[];
 }
 
+export interface OutcomeStandardErrors {
+  best_case?: number | null;
+  worst_case?: number | null;
+  median?: number | null;
+  probability_of_profit?: number | null;
+  probability_of_doubling?: number | null;
+  expected_value?: number | null;
+}
+
 export interface MonteCarloOutcomes {
   best_case: number;
   worst_case: number;
   median: number;
   probability_of_profit: number;
   probability_of_doubling: number;
+  expected_value?: number | null;
+  standard_error?: OutcomeStandardErrors | null;
 }
 
 export interface DistributionData {
@@ -157,6 +204,10 @@ export interface MonteCarloResult {
     time_horizon: number;
     simulations: number;
     confidence_interval: number;
+    mode?: "independent" | "correlated" | "bootstrap";
+    seed?: number | null;
+    variance_reduction?: "none" | "antithetic" | "control_variate" | "sobol";
+    max_points?: number | null;
   };
   projections: MonteCarloProjections;
   outcomes: MonteCarloOutcomes;
@@ -10,14 +10,34 @@ export const stockSymbolSchema = z.object({
   symbol: z.string().min(1, "Symbol is required"),
 });
 
+const isoDate = z
+  .string()
+  .regex(/^\d{4}-\d{2}-\d{2}$/, "Dates must be YYYY-MM-DD");
+
 export const stockHistorySchema = z.object({
   symbol: z.string().min(1, "Symbol is required"),
   period: z.string().optional().default("1y"),
+  // Explicit range; when given, only these dates are fetched
+  start: isoDate.optional(),
+  end: isoDate.optional(),
+});
+
+export const stockHistoryBatchSchema = z.object({
+  symbols: z
+    .array(z.string().min(1))
+    .min(1, "At least one symbol is required")
+    .max(100, "At most 100 symbols per batch"),
+  period: z.string().optional().default("1y"),
+  start: isoDate.optional(),
+  end: isoDate.optional(),
+  // {date, close} rows, JSON columns or packed binary (see utils/wire)
+  format: z.enum(["rows", "columns", "binary"]).optional().default("rows"),
 });
 
 export type StockSearchRequest = z.infer<typeof stockSearchSchema>;
 export type StockSymbolRequest = z.infer<typeof stockSymbolSchema>;
 export type StockHistoryRequest = z.infer<typeof stockHistorySchema>;
+export type StockHistoryBatchRequest = z.infer<typeof stockHistoryBatchSchema>;
 
 // Response types (matching frontend Asset interface)
 export interface StockSearchResult {
@@ -42,3 +62,16 @@ export interface StockHistoryResult {
   period: string;
   data: HistoricalDataPoint[];
 }
+
+// Same history as parallel date and close arrays
+export interface HistoryColumns {
+  dates: string[];
+  closes: number[];
+}
+
+// stock-api /history/batch?format=columns
+export interface StockHistoryBatchResult {
+  period: string;
+  histories: Array<HistoryColumns & { symbol: string; period: string }>;
+  missing: string[];
+}
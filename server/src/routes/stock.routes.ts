@@ -4,6 +4,7 @@ import { stockController } from "../controllers/stock.controller";
 const router = Router();
 
 router.get("/search", stockController.searchStocks);
+router.get("/history/batch", stockController.getStockHistories);
 router.get("/:symbol/basic", stockController.getStockBasic);
 router.get("/:symbol/history", stockController.getStockHistory);
 
@@ -2,7 +2,9 @@ import {
   StockSearchResult,
   StockBasicResult,
   StockHistoryResult,
+  StockHistoryBatchResult,
   HistoricalDataPoint,
+  HistoryColumns,
 } from "../dto/stock.dto";
 import { AppError, NotFound } from "../utils/errors";
 import { env } from "../config/env";
@@ -23,6 +25,8 @@ const getStockApiUrl = () => {
 
 const STOCK_API_URL = getStockApiUrl();
 const CACHE_DURATION = 300000; // 5 minutes
+// Symbols per stock-api /history/batch request (its MAX_BATCH_SIZE)
+const STOCK_API_BATCH_SIZE = 10;
 
 // Valid timeframes matching our UI and Python API
 const VALID_TIMEFRAMES = ["1D", "5D", "1M", "6M", "YTD", "1Y", "5Y", "MAX"];
@@ -42,6 +46,7 @@ export class StockService {
   private searchCache = new Map<string, CacheEntry<StockSearchResult[]>>();
   private quoteCache = new Map<string, CacheEntry<StockBasicResult>>();
   private historyCache = new Map<string, CacheEntry<HistoricalDataPoint[]>>();
+  private historyColumnsCache = new Map<string, CacheEntry<HistoryColumns>>();
 
   private validateTimeframe(timeframe: string): void {
     const timeframeUpper = timeframe.toUpperCase();
@@ -161,13 +166,17 @@ export class StockService {
 
   async getStockHistory(
     symbol: string,
-    timeframe: string = "1Y"
+    timeframe: string = "1Y",
+    start?: string,
+    end?: string
   ): Promise<HistoricalDataPoint[]> {
     // Validate timeframe
     this.validateTimeframe(timeframe);
 
     const timeframeUpper = timeframe.toUpperCase();
-    const cacheKey = `${symbol}:${timeframeUpper}`;
+    // An explicit start/end range replaces the timeframe bucket
+    const range = start ? `${start}/${end ?? ""}` : timeframeUpper;
+    const cacheKey = `${symbol}:${range}`;
     const cached = this.historyCache.get(cacheKey);
 
     if (cached && Date.now() - cached.timestamp < CACHE_DURATION) {
@@ -175,9 +184,12 @@ export class StockService {
     }
 
     try {
+      const params = new URLSearchParams({ timeframe });
+      if (start) params.set("start", start);
+      if (end) params.set("end", end);
       const url = `${STOCK_API_URL}/api/v1/history/${encodeURIComponent(
         symbol
-      )}?timeframe=${timeframe}`;
+      )}?${params}`;
       const response = await fetch(url);
 
       if (!response.ok) {
@@ -216,6 +228,90 @@ export class StockService {
     }
   }
 
+  /**
+   * Columnar histories for many symbols, keyed by symbol. Cached symbols are
+   * served locally; the rest are fetched from stock-api as JSON columns in
+   * batches of STOCK_API_BATCH_SIZE. Symbols without data have empty columns.
+   */
+  async getStockHistories(
+    symbols: string[],
+    timeframe: string = "1Y",
+    start?: string,
+    end?: string
+  ): Promise<Record<string, HistoryColumns>> {
+    this.validateTimeframe(timeframe);
+
+    const range = start ? `${start}/${end ?? ""}` : timeframe.toUpperCase();
+    const histories: Record<string, HistoryColumns> = {};
+    const uncached: string[] = [];
+    for (const symbol of new Set(symbols.map((s) => s.trim().toUpperCase()))) {
+      const cached = this.historyColumnsCache.get(`${symbol}:${range}`);
+      if (cached && Date.now() - cached.timestamp < CACHE_DURATION) {
+        histories[symbol] = cached.data;
+      } else {
+        uncached.push(symbol);
+      }
+    }
+
+    const batches: string[][] = [];
+    for (let i = 0; i < uncached.length; i += STOCK_API_BATCH_SIZE) {
+      batches.push(uncached.slice(i, i + STOCK_API_BATCH_SIZE));
+    }
+
+    try {
+      await Promise.all(
+        batches.map(async (batch) => {
+          const params = new URLSearchParams({
+            symbols: batch.join(","),
+            timeframe,
+            format: "columns",
+          });
+          if (start) params.set("start", start);
+          if (end) params.set("end", end);
+          const url = `${STOCK_API_URL}/api/v1/history/batch?${params}`;
+          const response = await fetch(url);
+
+          if (!response.ok) {
+            throw new AppError(
+              `Stock API responded with ${response.status}`,
+              500
+            );
+          }
+
+          const result =
+            (await response.json()) as StockApiResponse<StockHistoryBatchResult>;
+
+          if (!result.success) {
+            throw new AppError(result.error || "Batch history failed", 500);
+          }
+
+          for (const { symbol, dates, closes } of result.data.histories) {
+            histories[symbol] = { dates, closes };
+            this.historyColumnsCache.set(`${symbol}:${range}`, {
+              data: { dates, closes },
+              timestamp: Date.now(),
+            });
+          }
+          for (const symbol of result.data.missing) {
+            histories[symbol] = { dates: [], closes: [] };
+          }
+        })
+      );
+
+      return histories;
+    } catch (error) {
+      if (error instanceof AppError) {
+        throw error;
+      }
+      throw new AppError(
+        `Stock history batch failed: ${
+          error instanceof Error ? error.message : "Unknown error"
+        }`,
+        500
+      );
+    }
+  }
+
   async getDataAvailability(
     symbol: string
   ): Promise<Record<string, string | null>> {
@@ -0,0 +1,35 @@
+import { HistoryColumns } from "../dto/stock.dto";
+
+const DAY_MS = 86400000;
+
+/**
+ * Pack columnar histories into the binary layout shared with stock-api and
+ * scenario-api. All little-endian, one block per symbol:
+ *
+ *   uint16  symbol length, then the ASCII symbol
+ *   uint32  number of points n
+ *   int32   n day offsets since 1970-01-01
+ *   float64 n closes
+ *
+ * A symbol without data is a block with n = 0.
+ */
+export function encodeHistoryBinary(
+  histories: Record<string, HistoryColumns>
+): Buffer {
+  const blocks: Buffer[] = [];
+  for (const [symbol, { dates, closes }] of Object.entries(histories)) {
+    const name = Buffer.from(symbol, "ascii");
+    const block = Buffer.alloc(2 + name.length + 4 + dates.length * 12);
+    let offset = block.writeUInt16LE(name.length, 0);
+    offset += name.copy(block, offset);
+    offset = block.writeUInt32LE(dates.length, offset);
+    for (const date of dates) {
+      offset = block.writeInt32LE(Math.round(Date.parse(date) / DAY_MS), offset);
+    }
+    for (const close of closes) {
+      offset = block.writeDoubleLE(close, offset);
+    }
+    blocks.push(block);
+  }
+  return Buffer.concat(blocks);
+}
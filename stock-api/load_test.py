@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent history requests for different symbols.
+
+Requests go through the ASGI app in-process. By default yfinance is
+replaced by a stub that blocks for --latency seconds per download, so
+the run is deterministic and needs no network; --live calls Yahoo.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import pandas as pd
+
+import src.services.stock_service as stock_service_module
+from src.main import app
+from src.services.stock_service import stock_service
+from src.utils.upstream import upstream_pool
+
+
+class SlowTicker:
+    """yfinance.Ticker stand-in whose history() blocks like a real download."""
+
+    latency = 1.0
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, **kwargs):
+        time.sleep(self.latency)
+        index = pd.bdate_range("2024-01-01", periods=250)
+        return pd.DataFrame({"Close": range(1, 251)}, index=index, dtype=float)
+
+
+async def get(path):
+    """GET ``path`` through the ASGI app; returns (status, seconds)."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    return status.get("code"), time.perf_counter() - start
+
+
+async def run(symbols, timeframe):
+    """Fire all history requests at once while polling /health."""
+    stop = asyncio.Event()
+    health_latencies = []
+
+    async def poll_health():
+        while not stop.is_set():
+            _, elapsed = await get("/api/v1/health")
+            health_latencies.append(elapsed)
+            await asyncio.sleep(0.05)
+
+    poller = asyncio.create_task(poll_health())
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(get(f"/api/v1/history/{s}?timeframe={timeframe}") for s in symbols)
+    )
+    wall = time.perf_counter() - start
+    stop.set()
+    await poller
+    return wall, results, health_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--timeframe", default="1Y")
+    parser.add_argument("--live", action="store_true", help="call real yfinance")
+    args = parser.parse_args()
+
+    if args.live:
+        symbols = ["AAPL", "MSFT", "AMZN", "GOOGL", "META", "NVDA", "JPM", "XOM"]
+        symbols = symbols[: args.symbols]
+    else:
+        SlowTicker.latency = args.latency
+        stock_service_module.yf.Ticker = SlowTicker
+        symbols = [f"SYM{i}" for i in range(args.symbols)]
+
+    wall, results, health = asyncio.run(run(symbols, args.timeframe))
+    latencies = sorted(elapsed for _, elapsed in results)
+    ok = sum(1 for status, _ in results if status == 200)
+    workers = upstream_pool.max_workers
+    print(
+        f"{len(symbols)} history requests, {workers} upstream workers: "
+        f"{ok} ok in {wall:.2f} s wall"
+    )
+    print(
+        f"  request latency p50 {latencies[len(latencies) // 2]:.2f} s, "
+        f"max {latencies[-1]:.2f} s"
+    )
+    if not args.live:
+        serial = args.latency * len(symbols)
+        waves = -(-len(symbols) // workers)
+        print(
+            f"  serial would take {serial:.2f} s; pool bound is {waves} x "
+            f"{args.latency:.2f} s = {waves * args.latency:.2f} s "
+            f"({serial / wall:.1f}x overlap)"
+        )
+    if health:
+        print(
+            f"  /health during load: {len(health)} calls, "
+            f"max {max(health) * 1000:.1f} ms"
+        )
+    print(f"  upstream pool: {upstream_pool.stats()}")
+    print(f"  coalescing: {stock_service.history_flight.stats()}")
+    return ok == len(symbols)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
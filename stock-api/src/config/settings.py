@@ -10,12 +10,33 @@ CORS_ORIGINS: List[str] = ["*"]
 
 # Cache settings
 CACHE_DURATION = 300  # 5 minutes
+# Per-cache entry budgets and lifetimes: quotes go stale fastest, searches
+# rarely change, daily histories are kept until the next market close
+QUOTE_CACHE_SIZE = int(os.getenv("QUOTE_CACHE_SIZE", "2048"))
+QUOTE_CACHE_TTL = int(os.getenv("QUOTE_CACHE_TTL", "60"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "3600"))
+HISTORY_CACHE_SIZE = int(os.getenv("HISTORY_CACHE_SIZE", "4096"))
+HISTORY_CACHE_MAX_BYTES = int(os.getenv("HISTORY_CACHE_MAX_BYTES", "268435456"))
+# Symbols with no data are remembered briefly so repeat batches skip yfinance
+MISSING_HISTORY_TTL = int(os.getenv("MISSING_HISTORY_TTL", "900"))
 
 # API settings
-MAX_BATCH_SIZE = 10
+# Symbols per /history/batch request (one yf.download call)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10"))
 MIN_QUERY_LENGTH = 2
 DEFAULT_SEARCH_LIMIT = 10
 
+# Upstream settings
+# Threads running blocking yfinance calls; further requests queue for a slot
+UPSTREAM_MAX_WORKERS = int(os.getenv("UPSTREAM_MAX_WORKERS", "8"))
+
+# Response settings
+# Fast JSON responses are gzipped from this many bytes when the client
+# accepts it; level 1 trades a slightly larger body for far less CPU
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "1"))
+
 # Server settings
 HOST = "0.0.0.0" if IS_PRODUCTION else "127.0.0.1"
 PORT = int(os.getenv("PORT", "8001"))
@@ -1,45 +1,125 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request, Response
+from typing import Literal, Optional, Union
 from ..services.stock_service import stock_service
 from ..dto.stock import (
     SearchResponse,
     BasicResponse,
     OverviewResponse,
     HistoryResponse,
+    HistoryColumnsResponse,
+    BatchHistory,
+    BatchHistoryResponse,
+    BatchHistoryColumnsResponse,
+    StockHistoryColumns,
 )
+from ..utils.responses import FastJSONResponse
+from ..utils.upstream import upstream_pool
+from ..utils.wire import BINARY_MEDIA_TYPE, encode_binary, to_rows
 from ..config.settings import DEFAULT_SEARCH_LIMIT
 
 router = APIRouter()
 
+# History wire formats: {date, close} rows, JSON columns or packed binary
+HistoryFormat = Literal["rows", "columns", "binary"]
+
 
 @router.get("/search", response_model=SearchResponse)
 async def search_stocks(q: str, limit: int = DEFAULT_SEARCH_LIMIT):
-    stocks = stock_service.search_stocks(q, limit)
+    stocks = await stock_service.search_stocks(q, limit)
     return SearchResponse(success=True, data=stocks)
 
 
 @router.get("/basic/{symbol}", response_model=BasicResponse)
 async def get_stock_basic(symbol: str):
-    basic = stock_service.get_stock_basic(symbol)
+    basic = await stock_service.get_stock_basic(symbol)
     return BasicResponse(success=True, data=basic)
 
 
 @router.get("/quote/{symbol}", response_model=OverviewResponse)
 async def get_stock_overview(symbol: str):
-    overview = stock_service.get_stock_overview(symbol)
+    overview = await stock_service.get_stock_overview(symbol)
     return OverviewResponse(success=True, data=overview)
 
 
-@router.get("/history/{symbol}", response_model=HistoryResponse)
-async def get_stock_history(symbol: str, timeframe: str = "1Y"):
+@router.get(
+    "/history/batch",
+    response_model=Union[BatchHistoryResponse, BatchHistoryColumnsResponse],
+)
+async def get_stock_histories(
+    symbols: str,
+    request: Request,
+    timeframe: str = "1Y",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    fmt: HistoryFormat = Query("rows", alias="format"),
+):
+    """
+    Get historical data for several symbols in one request.
+
+    Args:
+        symbols: Comma-separated stock symbols (at most MAX_BATCH_SIZE)
+        timeframe: One of "1D", "5D", "1M", "6M", "YTD", "1Y", "5Y", "Max"
+        start: Optional first date (YYYY-MM-DD); overrides the timeframe
+        end: Optional last date (YYYY-MM-DD, inclusive)
+        format: "rows" (default), "columns" or "binary"; binary encodes
+            missing symbols as empty blocks
+    """
+    batch = await stock_service.get_stock_histories(
+        symbols.split(","), timeframe, start, end
+    )
+    if fmt == "binary":
+        empty = [
+            StockHistoryColumns(symbol=s, period=batch.period, dates=[], closes=[])
+            for s in batch.missing
+        ]
+        return Response(
+            encode_binary(batch.histories + empty), media_type=BINARY_MEDIA_TYPE
+        )
+    if fmt == "columns":
+        return FastJSONResponse(
+            BatchHistoryColumnsResponse(success=True, data=batch), request
+        )
+    rows = BatchHistory(
+        period=batch.period,
+        histories=[to_rows(h) for h in batch.histories],
+        missing=batch.missing,
+    )
+    return FastJSONResponse(BatchHistoryResponse(success=True, data=rows), request)
+
+
+# Declared after /history/batch so "batch" is not taken for a symbol
+@router.get(
+    "/history/{symbol}",
+    response_model=Union[HistoryResponse, HistoryColumnsResponse],
+)
+async def get_stock_history(
+    symbol: str,
+    request: Request,
+    timeframe: str = "1Y",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    fmt: HistoryFormat = Query("rows", alias="format"),
+):
     """
-    Get historical stock data for the specified timeframe.
+    Get historical stock data for the specified timeframe or date range.
 
     Args:
         symbol: Stock symbol (e.g., "AAPL")
         timeframe: One of "1D", "5D", "1M", "6M", "YTD", "1Y", "5Y", "Max"
+        start: Optional first date (YYYY-MM-DD); overrides the timeframe
+        end: Optional last date (YYYY-MM-DD, inclusive)
+        format: "rows" (default), "columns" or "binary"
     """
-    history = stock_service.get_stock_history(symbol, timeframe)
-    return HistoryResponse(success=True, data=history)
+    history = await stock_service.get_stock_history(symbol, timeframe, start, end)
+    if fmt == "binary":
+        return Response(encode_binary([history]), media_type=BINARY_MEDIA_TYPE)
+    if fmt == "columns":
+        return FastJSONResponse(
+            HistoryColumnsResponse(success=True, data=history), request
+        )
+    return FastJSONResponse(
+        HistoryResponse(success=True, data=to_rows(history)), request
+    )
 
 
 @router.get("/availability/{symbol}")
@@ -48,10 +128,24 @@ async def get_data_availability(symbol: str):
     Get information about data availability for different timeframes.
     Returns which timeframes have data and their oldest available dates.
     """
-    availability = stock_service.get_data_availability_info(symbol)
+    availability = await stock_service.get_data_availability_info(symbol)
     return {"success": True, "data": availability}
 
 
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters and sizes for the stock data caches"""
+    return {"success": True, "data": stock_service.cache_stats()}
+
+
+@router.get("/upstream/stats")
+async def upstream_stats():
+    """Upstream thread pool usage and history download coalescing counters"""
+    stats = upstream_pool.stats()
+    stats["coalescing"] = stock_service.history_flight.stats()
+    return {"success": True, "data": stats}
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint with version info"""
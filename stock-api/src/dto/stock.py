@@ -33,6 +33,27 @@ class StockHistory(BaseModel):
     data: List[HistoricalDataPoint]
 
 
+# Same history as parallel date and close arrays
+class StockHistoryColumns(BaseModel):
+    symbol: str
+    period: str
+    dates: List[str]
+    closes: List[float]
+
+
+class BatchHistory(BaseModel):
+    period: str
+    histories: List[StockHistory]
+    # Requested symbols with no data in the period
+    missing: List[str]
+
+
+class BatchHistoryColumns(BaseModel):
+    period: str
+    histories: List[StockHistoryColumns]
+    missing: List[str]
+
+
 class SearchResponse(BaseModel):
     success: bool
     data: List[StockSearch]
@@ -53,6 +74,21 @@ class HistoryResponse(BaseModel):
     data: StockHistory
 
 
+class HistoryColumnsResponse(BaseModel):
+    success: bool
+    data: StockHistoryColumns
+
+
+class BatchHistoryResponse(BaseModel):
+    success: bool
+    data: BatchHistory
+
+
+class BatchHistoryColumnsResponse(BaseModel):
+    success: bool
+    data: BatchHistoryColumns
+
+
 class ErrorResponse(BaseModel):
     success: bool
     error: str
@@ -1,12 +1,24 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from .config.settings import CORS_ORIGINS, HOST, PORT
 from .controllers.stock_controller import router as stock_router
 from .middleware.error_handler import error_handler
+from .utils.upstream import upstream_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    upstream_pool.shutdown()
+
 
 app = FastAPI(
-    title="Stock API", version="1.0.0", description="Clean stock market data API"
+    title="Stock API",
+    version="1.0.0",
+    description="Clean stock market data API",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -1,16 +1,32 @@
 import yfinance as yf
-import time
-from typing import List, Dict, Optional
+import pandas as pd
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from ..dto.stock import (
     StockOverview,
     StockSearch,
     StockBasic,
-    StockHistory,
     HistoricalDataPoint,
+    StockHistoryColumns,
+    BatchHistoryColumns,
+)
+from ..utils.errors import AppError, NotFound, BadRequest, InternalServerError
+from ..utils.cache import TTLCache
+from ..utils.singleflight import SingleFlight
+from ..utils.upstream import upstream_pool
+from ..config.settings import (
+    CACHE_DURATION,
+    HISTORY_CACHE_MAX_BYTES,
+    HISTORY_CACHE_SIZE,
+    MAX_BATCH_SIZE,
+    MIN_QUERY_LENGTH,
+    MISSING_HISTORY_TTL,
+    QUOTE_CACHE_SIZE,
+    QUOTE_CACHE_TTL,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
 )
-from ..utils.errors import NotFound, BadRequest, InternalServerError
-from ..config.settings import CACHE_DURATION, MIN_QUERY_LENGTH
 
 # Timeframe mapping from UI to yfinance periods
 TIMEFRAME_MAPPING: Dict[str, str] = {
@@ -27,12 +43,57 @@ TIMEFRAME_MAPPING: Dict[str, str] = {
 # Valid timeframes for validation
 VALID_TIMEFRAMES = list(TIMEFRAME_MAPPING.keys())
 
+# Short views whose latest bar moves during the session
+INTRADAY_TIMEFRAMES = {"1D", "5D"}
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_CLOSE_HOUR = 16
+
+# Approximate memory per history point: date string, float and list slots
+HISTORY_POINT_BYTES = 100
+
+# History cache value for a symbol/timeframe yfinance had no data for
+NO_HISTORY = object()
+
+
+def seconds_until_market_close(now: Optional[datetime] = None) -> float:
+    """
+    Seconds until the next weekday 16:00 New York close.
+
+    Exchange holidays are ignored; an entry then just expires a day early.
+    """
+    now = now or datetime.now(MARKET_TIMEZONE)
+    close = now.replace(hour=MARKET_CLOSE_HOUR, minute=0, second=0, microsecond=0)
+    while close <= now or close.weekday() >= 5:
+        close += timedelta(days=1)
+    return (close - now).total_seconds()
+
+
+def _history_bytes(history: StockHistoryColumns) -> int:
+    if history is NO_HISTORY:
+        return 0
+    return HISTORY_POINT_BYTES * len(history.closes)
+
 
 class StockService:
+    """
+    Stock data from yfinance behind in-process caches.
+
+    The public methods are async and run the blocking implementations in
+    the shared upstream thread pool, so yfinance never blocks the event loop.
+    """
+
     def __init__(self):
-        self.overview_cache = {}
-        self.search_cache = {}
-        self.history_cache = {}
+        self.overview_cache = TTLCache(QUOTE_CACHE_SIZE, QUOTE_CACHE_TTL)
+        self.basic_cache = TTLCache(QUOTE_CACHE_SIZE, QUOTE_CACHE_TTL)
+        self.search_cache = TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+        self.history_cache = TTLCache(
+            HISTORY_CACHE_SIZE,
+            CACHE_DURATION,
+            max_bytes=HISTORY_CACHE_MAX_BYTES,
+            weigher=_history_bytes,
+        )
+        self.history_flight = SingleFlight()
 
     def _validate_and_map_timeframe(self, timeframe: str) -> str:
         """
@@ -64,15 +125,54 @@ class StockService:
         dates = [point.date for point in historical_data]
         return min(dates), max(dates)
 
-    def search_stocks(self, query: str, limit: int = 10) -> List[StockSearch]:
+    async def search_stocks(self, query: str, limit: int = 10) -> List[StockSearch]:
+        """Search for stocks by name or symbol."""
+        return await upstream_pool.run(self._search_stocks, query, limit)
+
+    async def get_stock_basic(self, symbol: str) -> StockBasic:
+        """Basic stock info and the latest price."""
+        return await upstream_pool.run(self._get_stock_basic, symbol)
+
+    async def get_stock_overview(self, symbol: str) -> StockOverview:
+        """Quote overview for a symbol."""
+        return await upstream_pool.run(self._get_stock_overview, symbol)
+
+    async def get_stock_history(
+        self,
+        symbol: str,
+        timeframe: str = "1Y",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> StockHistoryColumns:
+        """History for one symbol; see :meth:`_get_stock_history`."""
+        return await upstream_pool.run(
+            self._get_stock_history, symbol, timeframe, start, end
+        )
+
+    async def get_stock_histories(
+        self,
+        symbols: List[str],
+        timeframe: str = "1Y",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> BatchHistoryColumns:
+        """Histories for several symbols; see :meth:`_get_stock_histories`."""
+        return await upstream_pool.run(
+            self._get_stock_histories, symbols, timeframe, start, end
+        )
+
+    async def get_data_availability_info(self, symbol: str) -> Dict[str, Optional[str]]:
+        """Oldest available date per timeframe for a symbol."""
+        return await upstream_pool.run(self._get_data_availability_info, symbol)
+
+    def _search_stocks(self, query: str, limit: int = 10) -> List[StockSearch]:
         if len(query) < MIN_QUERY_LENGTH:
             raise BadRequest("Query too short")
 
         cache_key = f"{query}:{limit}"
-        if cache_key in self.search_cache:
-            cached_data, timestamp = self.search_cache[cache_key]
-            if time.time() - timestamp < CACHE_DURATION:
-                return cached_data
+        cached_data = self.search_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
 
         try:
             search = yf.Search(query, max_results=limit)
@@ -86,15 +186,19 @@ class StockService:
                 if symbol and name:
                     results.append(StockSearch(symbol=symbol, name=name))
 
-            self.search_cache[cache_key] = (results, time.time())
+            self.search_cache.set(cache_key, results)
             return results
 
         except Exception as e:
             raise InternalServerError(f"Search failed: {str(e)}")
 
-    def get_stock_basic(self, symbol: str) -> StockBasic:
+    def _get_stock_basic(self, symbol: str) -> StockBasic:
         symbol = symbol.upper()
 
+        cached_data = self.basic_cache.get(symbol)
+        if cached_data is not None:
+            return cached_data
+
         try:
             ticker = yf.Ticker(symbol)
             info = ticker.info
@@ -109,23 +213,25 @@ class StockService:
             name = info.get("longName", info.get("shortName", symbol))
             sector = info.get("sector")
 
-            return StockBasic(
+            basic = StockBasic(
                 symbol=symbol,
                 name=name,
                 current_price=float(current_price) if current_price else None,
                 sector=sector,
             )
 
+            self.basic_cache.set(symbol, basic)
+            return basic
+
         except Exception as e:
             raise InternalServerError(f"Stock basic failed: {str(e)}")
 
-    def get_stock_overview(self, symbol: str) -> StockOverview:
+    def _get_stock_overview(self, symbol: str) -> StockOverview:
         symbol = symbol.upper()
 
-        if symbol in self.overview_cache:
-            cached_data, timestamp = self.overview_cache[symbol]
-            if time.time() - timestamp < CACHE_DURATION:
-                return cached_data
+        cached_data = self.overview_cache.get(symbol)
+        if cached_data is not None:
+            return cached_data
 
         try:
             ticker = yf.Ticker(symbol)
@@ -153,7 +259,7 @@ class StockService:
                 sector=sector,
             )
 
-            self.overview_cache[symbol] = (overview, time.time())
+            self.overview_cache.set(symbol, overview)
             return overview
 
         except NotFound:
@@ -161,66 +267,278 @@ class StockService:
         except Exception as e:
             raise InternalServerError(f"Stock overview failed: {str(e)}")
 
-    def get_stock_history(self, symbol: str, timeframe: str = "1Y") -> StockHistory:
+    def _validate_date_range(
+        self, start: Optional[str], end: Optional[str]
+    ) -> Dict[str, str]:
         """
-        Get historical stock data for the specified timeframe.
+        Validate an explicit YYYY-MM-DD range and map it to yfinance arguments.
+        yfinance treats ``end`` as exclusive, so one day is added to include it.
+        """
+        if end and not start:
+            raise BadRequest("start is required when end is given")
+        try:
+            start_dt = datetime.strptime(start, "%Y-%m-%d")
+            end_dt = datetime.strptime(end, "%Y-%m-%d") if end else None
+        except ValueError:
+            raise BadRequest("start and end must be YYYY-MM-DD dates")
+        if end_dt and end_dt < start_dt:
+            raise BadRequest("start must not be after end")
+
+        yf_range = {"start": start_dt.strftime("%Y-%m-%d")}
+        if end_dt:
+            yf_range["end"] = (end_dt + timedelta(days=1)).strftime("%Y-%m-%d")
+        return yf_range
+
+    def _history_request(
+        self, timeframe: str, start: Optional[str], end: Optional[str]
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Resolve a timeframe or explicit date range.
+        Returns (period label used in cache keys and responses, yfinance kwargs).
+        """
+        if start or end:
+            # Explicit range: only download the dates that were asked for
+            return f"{start}/{end or ''}", self._validate_date_range(start, end)
+        # Validate and map timeframe
+        timeframe_upper = timeframe.upper()
+        return timeframe_upper, {
+            "period": self._validate_and_map_timeframe(timeframe_upper)
+        }
+
+    def _cache_history(self, cache_key: str, history: StockHistoryColumns) -> None:
+        """Cache a daily history until the next close, short views briefly."""
+        ttl = (
+            CACHE_DURATION
+            if history.period in INTRADAY_TIMEFRAMES
+            else seconds_until_market_close()
+        )
+        self.history_cache.set(cache_key, history, ttl)
+
+    def _get_stock_history(
+        self,
+        symbol: str,
+        timeframe: str = "1Y",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> StockHistoryColumns:
+        """
+        Get historical stock data for the specified timeframe or date range.
 
         Args:
             symbol: Stock symbol (e.g., "AAPL")
             timeframe: One of "1D", "5D", "1M", "6M", "YTD", "1Y", "5Y", "Max"
+            start: Optional first date (YYYY-MM-DD); overrides the timeframe
+            end: Optional last date (YYYY-MM-DD, inclusive), requires start
 
         Returns:
-            StockHistory with actual data available for the symbol
+            Columnar history with the actual data available for the symbol
         """
         symbol = symbol.upper()
-        timeframe_upper = timeframe.upper()
-
-        # Validate and map timeframe
-        yf_period = self._validate_and_map_timeframe(timeframe_upper)
-
+        timeframe_upper, history_args = self._history_request(timeframe, start, end)
         cache_key = f"{symbol}:{timeframe_upper}"
 
-        if cache_key in self.history_cache:
-            cached_data, timestamp = self.history_cache[cache_key]
-            if time.time() - timestamp < CACHE_DURATION:
-                return cached_data
-
+        cached_data = self.history_cache.get(cache_key)
+        if cached_data is NO_HISTORY:
+            raise NotFound(
+                f"No historical data available for {symbol} in timeframe {timeframe_upper}"
+            )
+        if cached_data is not None:
+            return cached_data
+
+        # Identical downloads already in flight are shared, not repeated
+        return self.history_flight.do(
+            cache_key,
+            lambda: self._download_history(
+                symbol, timeframe_upper, history_args, cache_key
+            ),
+        )
+
+    def _download_history(
+        self,
+        symbol: str,
+        timeframe_upper: str,
+        history_args: Dict[str, str],
+        cache_key: str,
+    ) -> StockHistoryColumns:
+        """Download, convert and cache one history from yfinance."""
         try:
             ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=yf_period)
+            hist = ticker.history(**history_args)
 
             if hist.empty:
+                self.history_cache.set(cache_key, NO_HISTORY, MISSING_HISTORY_TTL)
                 raise NotFound(
-                    f"No historical data available for {symbol} in timeframe {timeframe}"
+                    f"No historical data available for {symbol} in timeframe {timeframe_upper}"
                 )
 
-            # Convert to our format
-            historical_points = [
-                HistoricalDataPoint(date=date.strftime("%Y-%m-%d"), close=float(close))
-                for date, close in hist["Close"].items()
-            ]
+            # Columnar history; {date, close} rows are only built on request
+            history = self._to_columns(symbol, timeframe_upper, hist["Close"])
 
-            # Get actual data range
-            actual_start, actual_end = self._get_actual_data_range(historical_points)
-
-            # Create history object with metadata about actual range
-            history = StockHistory(
-                symbol=symbol,
-                period=timeframe_upper,  # Return the original UI timeframe
-                data=historical_points,
-            )
-
-            self.history_cache[cache_key] = (history, time.time())
+            self._cache_history(cache_key, history)
             return history
 
-        except NotFound:
-            raise
-        except BadRequest:
+        except AppError:
+            # NotFound/BadRequest are factories returning AppError
             raise
         except Exception as e:
             raise InternalServerError(f"History failed for {symbol}: {str(e)}")
 
-    def get_data_availability_info(self, symbol: str) -> Dict[str, Optional[str]]:
+    def _to_columns(
+        self, symbol: str, timeframe_upper: str, closes: pd.Series
+    ) -> StockHistoryColumns:
+        """Convert a date-indexed close series to a columnar history."""
+        return StockHistoryColumns(
+            symbol=symbol,
+            period=timeframe_upper,  # Return the original UI timeframe
+            dates=closes.index.strftime("%Y-%m-%d").tolist(),
+            closes=closes.astype(float).tolist(),
+        )
+
+    def _get_stock_histories(
+        self,
+        symbols: List[str],
+        timeframe: str = "1Y",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> BatchHistoryColumns:
+        """
+        Get historical data for several symbols at once.
+
+        Cached symbols are served from the history cache; the rest are
+        downloaded together in a single yf.download call.
+
+        Args:
+            symbols: Stock symbols, at most MAX_BATCH_SIZE distinct ones
+            timeframe: One of "1D", "5D", "1M", "6M", "YTD", "1Y", "5Y", "Max"
+            start: Optional first date (YYYY-MM-DD); overrides the timeframe
+            end: Optional last date (YYYY-MM-DD, inclusive), requires start
+
+        Returns:
+            Columnar histories for the symbols that have data, and the
+            symbols that had none
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        if not symbols:
+            raise BadRequest("At least one symbol is required")
+        if len(symbols) > MAX_BATCH_SIZE:
+            raise BadRequest(f"At most {MAX_BATCH_SIZE} symbols per batch")
+        timeframe_upper, history_args = self._history_request(timeframe, start, end)
+
+        histories: Dict[str, StockHistoryColumns] = {}
+        uncached: List[str] = []
+        for symbol in symbols:
+            cached_data = self.history_cache.get(f"{symbol}:{timeframe_upper}")
+            if cached_data is NO_HISTORY:
+                # Known to have no data; reported as missing
+                continue
+            if cached_data is not None:
+                histories[symbol] = cached_data
+            else:
+                uncached.append(symbol)
+
+        if uncached:
+            # Keyed like single-symbol requests, so a symbol already being
+            # downloaded by any request is awaited instead of fetched again
+            keys = {f"{symbol}:{timeframe_upper}": symbol for symbol in uncached}
+            claimed, waiting = self.history_flight.claim(keys)
+            if claimed:
+                histories.update(
+                    self._download_claimed(
+                        [keys[key] for key in claimed], timeframe_upper, history_args
+                    )
+                )
+            for key, future in waiting.items():
+                try:
+                    histories[keys[key]] = future.result()
+                except AppError as e:
+                    if e.status_code != 404:
+                        raise
+
+        return BatchHistoryColumns(
+            period=timeframe_upper,
+            histories=[histories[s] for s in symbols if s in histories],
+            missing=[s for s in symbols if s not in histories],
+        )
+
+    def _download_claimed(
+        self,
+        symbols: List[str],
+        timeframe_upper: str,
+        history_args: Dict[str, str],
+    ) -> Dict[str, StockHistoryColumns]:
+        """Download symbols claimed in the history flight and publish each result."""
+        try:
+            histories = self._download_histories(symbols, timeframe_upper, history_args)
+        except BaseException as e:
+            for symbol in symbols:
+                self.history_flight.complete(f"{symbol}:{timeframe_upper}", error=e)
+            raise
+        for symbol in symbols:
+            history = histories.get(symbol)
+            if history is None:
+                # Single-symbol waiters see the same error as their own download
+                self.history_flight.complete(
+                    f"{symbol}:{timeframe_upper}",
+                    error=NotFound(
+                        f"No historical data available for {symbol} in timeframe {timeframe_upper}"
+                    ),
+                )
+            else:
+                self.history_flight.complete(f"{symbol}:{timeframe_upper}", history)
+        return histories
+
+    def _download_histories(
+        self,
+        symbols: List[str],
+        timeframe_upper: str,
+        history_args: Dict[str, str],
+    ) -> Dict[str, StockHistoryColumns]:
+        """
+        Download several histories in one yfinance request and cache them.
+
+        Symbols that come back without data are cached as NO_HISTORY for
+        MISSING_HISTORY_TTL seconds.
+        """
+        try:
+            data = yf.download(
+                tickers=symbols,
+                auto_adjust=True,
+                progress=False,
+                threads=True,
+                **history_args,
+            )
+        except Exception as e:
+            raise InternalServerError(f"Batch history failed: {str(e)}")
+        closes = pd.DataFrame()
+        if data is not None and not data.empty:
+            closes = data["Close"]
+            if isinstance(closes, pd.Series):
+                # Older yfinance returns flat columns for a single ticker
+                closes = closes.to_frame(symbols[0])
+
+        histories: Dict[str, StockHistoryColumns] = {}
+        for symbol in symbols:
+            series = closes[symbol].dropna() if symbol in closes else None
+            if series is None or series.empty:
+                self.history_cache.set(
+                    f"{symbol}:{timeframe_upper}", NO_HISTORY, MISSING_HISTORY_TTL
+                )
+                continue
+            history = self._to_columns(symbol, timeframe_upper, series)
+            self._cache_history(f"{symbol}:{timeframe_upper}", history)
+            histories[symbol] = history
+        return histories
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit/miss/eviction counters for each cache"""
+        return {
+            "search": self.search_cache.stats(),
+            "basic": self.basic_cache.stats(),
+            "overview": self.overview_cache.stats(),
+            "history": self.history_cache.stats(),
+        }
+
+    def _get_data_availability_info(self, symbol: str) -> Dict[str, Optional[str]]:
         """
         Get information about data availability for different timeframes.
         Returns a dict with timeframe -> oldest_available_date mapping.
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe bounded LRU cache with per-entry expiry.
+
+    Bounded by entry count and, when a ``weigher`` is given, by the summed
+    weight of its values in bytes. Inserting past either budget first drops
+    expired entries, then the least recently used ones.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.weigher = weigher
+        # key -> (value, expires_at, weight)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ``ttl`` seconds (the cache default when None)."""
+        weight = self.weigher(value) if self.weigher else 0
+        if self.max_bytes is not None and weight > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, weight)
+            self.bytes += weight
+            if self._over_budget():
+                self._purge_expired()
+            while self._over_budget():
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
+
+    def _over_budget(self) -> bool:
+        if len(self._data) > self.maxsize:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, weight = self._data.pop(key)
+        self.bytes -= weight
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            k for k, (_, expires_at, _) in self._data.items() if now >= expires_at
+        ]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
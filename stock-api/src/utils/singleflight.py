@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first thread to ask for a key runs the function; threads asking for
+    it while that call is running wait for its result (or exception) instead
+    of repeating the work.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` for ``key`` unless a call for it is already in flight."""
+        claimed, waiting = self.claim([key])
+        if not claimed:
+            return waiting[key].result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.complete(key, error=e)
+            raise
+        self.complete(key, result)
+        return result
+
+    def claim(
+        self, keys: Iterable[Hashable]
+    ) -> Tuple[List[Hashable], Dict[Hashable, Future]]:
+        """
+        Claim every key that is not already in flight.
+
+        Lets one call do the work for several keys at once. The caller must
+        :meth:`complete` each claimed key, and should do so before waiting
+        on the futures of keys other callers are running.
+
+        Returns:
+            (keys claimed by this caller, futures of the keys already in flight)
+        """
+        claimed: List[Hashable] = []
+        waiting: Dict[Hashable, Future] = {}
+        with self._lock:
+            for key in keys:
+                self.calls += 1
+                future = self._in_flight.get(key)
+                if future is None:
+                    self._in_flight[key] = Future()
+                    claimed.append(key)
+                else:
+                    self.shared += 1
+                    waiting[key] = future
+        return claimed, waiting
+
+    def complete(
+        self,
+        key: Hashable,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Publish a claimed key's result, or ``error``, to its waiters."""
+        with self._lock:
+            future = self._in_flight.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, int]:
+        """Calls made, calls served by another caller's request, and keys in flight."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "in_flight": len(self._in_flight),
+            }
@@ -0,0 +1,72 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from ..config.settings import UPSTREAM_MAX_WORKERS
+
+T = TypeVar("T")
+
+
+class UpstreamPool:
+    """
+    Bounded thread pool for blocking yfinance calls.
+
+    Routes are async, so a synchronous download on the event loop stalls
+    every other request (including /health). Calls run here instead: at
+    most ``max_workers`` at once, the rest wait in the pool's queue.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="upstream"
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, fn, *args)
+        )
+
+    def _call(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop calls that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Worker limit, calls running and queued, and completion counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": self.submitted - self.completed - self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+
+# Shared pool for all upstream calls
+upstream_pool = UpstreamPool(UPSTREAM_MAX_WORKERS)
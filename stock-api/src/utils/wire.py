@@ -0,0 +1,50 @@
+"""
+Columnar and binary encodings of price histories.
+
+Binary layout, all little-endian, one block per history:
+
+    uint16  symbol length in bytes
+    bytes   symbol (ASCII)
+    uint32  number of points n
+    int32   n day offsets since 1970-01-01
+    float64 n closes
+
+A batch response is the blocks concatenated; a symbol without data is a
+block with n = 0.
+"""
+
+import struct
+from typing import List
+
+import numpy as np
+
+from ..dto.stock import HistoricalDataPoint, StockHistory, StockHistoryColumns
+
+BINARY_MEDIA_TYPE = "application/octet-stream"
+
+
+def to_rows(history: StockHistoryColumns) -> StockHistory:
+    """Expand a columnar history into {date, close} points."""
+    return StockHistory(
+        symbol=history.symbol,
+        period=history.period,
+        data=[
+            HistoricalDataPoint(date=d, close=c)
+            for d, c in zip(history.dates, history.closes)
+        ],
+    )
+
+
+def encode_binary(histories: List[StockHistoryColumns]) -> bytes:
+    """Pack histories into the binary block layout."""
+    parts: List[bytes] = []
+    for history in histories:
+        symbol = history.symbol.encode("ascii")
+        days = np.array(history.dates, dtype="datetime64[D]").astype("<i4")
+        closes = np.asarray(history.closes, dtype="<f8")
+        parts.append(struct.pack("<H", len(symbol)))
+        parts.append(symbol)
+        parts.append(struct.pack("<I", len(closes)))
+        parts.append(days.tobytes())
+        parts.append(closes.tobytes())
+    return b"".join(parts)